@@ -13,3 +13,4 @@ MIN_THUMB_SIZE = 50
 MAX_THUMB_SIZE = 2000
 MIN_THUMB_LOAD_THRESHOLD = 0
 MAX_THUMB_LOAD_THRESHOLD = 1000
+PIXMAP_CACHE_SIZE = 256 * 1024  # In KiB
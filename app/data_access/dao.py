@@ -1,20 +1,33 @@
+from __future__ import annotations
+
 import abc
 import pathlib
 import re
 import sqlite3
+import typing as typ
 
 from .. import utils
+from ..logging import logger
 
 
 class DAO(abc.ABC):
     """Base class for DAO objects. It defines 'REGEX', 'RINSTR' and 'SIMILAR' functions to use in SQL queries."""
+    _CACHE_SIZE = 64000  # In KiB
 
-    def __init__(self, database: pathlib.Path):
+    def __init__(self, database: pathlib.Path, shared_with: DAO = None):
         """Initializes this DAO using the given database.
 
         :param database: The database file to connect to.
+        :param shared_with: Optional. A DAO connected to the same database whose connection will be reused.
+            Both DAOs must then be used from the same thread. Only the DAO that opened the connection can close it.
         """
         self._database_path = database
+        self._owns_connection = shared_with is None
+        if shared_with is not None:
+            if shared_with.database_path != database:
+                raise ValueError(f'cannot share connection to "{shared_with.database_path}" with "{database}"')
+            self._connection = shared_with._connection
+            return
         self._connection = sqlite3.connect(str(self._database_path))
         # Disable autocommit when BEGIN has been called.
         self._connection.isolation_level = None
@@ -22,14 +35,42 @@ class DAO(abc.ABC):
         self._connection.create_function('RINSTR', 2, self._rinstr, deterministic=True)
         self._connection.create_function('SIMILAR', 2, self._similarity)
         self._connection.execute('PRAGMA foreign_keys = ON')
+        self._connection.execute('PRAGMA temp_store = MEMORY')
+        self._connection.execute(f'PRAGMA cache_size = {-self._CACHE_SIZE}')
 
     @property
     def database_path(self) -> pathlib.Path:
         return self._database_path
 
+    def run_in_transaction(self, action: typ.Callable[[], bool]) -> bool:
+        """Calls the given action so that all queries it makes are committed at once in a single transaction.
+        The action must not start transactions itself.
+
+        :param action: The action to call. It must return whether it succeeded.
+        :return: The action’s result or False if the transaction could not be started or committed.
+        """
+        try:
+            self._connection.execute('BEGIN')
+        except sqlite3.Error as e:
+            logger.exception(e)
+            return False
+        try:
+            result = action()
+        except BaseException:
+            self._connection.rollback()
+            raise
+        try:
+            self._connection.commit()
+        except sqlite3.Error as e:
+            logger.exception(e)
+            self._connection.rollback()
+            return False
+        return result
+
     def close(self):
-        """Closes database connection."""
-        self._connection.close()
+        """Closes database connection. Does nothing if the connection is shared with another DAO that opened it."""
+        if self._owns_connection:
+            self._connection.close()
 
     @staticmethod
     def _regexp(pattern: str, string: str) -> bool:
@@ -2,6 +2,7 @@ import pathlib
 import re
 import sqlite3
 
+import numpy as np
 import sympy as sp
 
 from .dao import DAO
@@ -11,6 +12,46 @@ from ..i18n import translate as _t
 from ..logging import logger
 
 
+class ImagesSnapshot:
+    """Raw rows of registered images with their hashes loaded in a single array."""
+
+    def __init__(self, results: list[tuple[int, str, bytes | None]]):
+        """Creates a snapshot.
+
+        :param results: (id, path, hash) rows of the images table.
+        """
+        self._results = results
+        self._indices_by_path: dict[str, list[int]] = {}
+        hashed_indices = []
+        for i, result in enumerate(results):
+            self._indices_by_path.setdefault(result[1], []).append(i)
+            if result[2] is not None:
+                hashed_indices.append(i)
+        self._hashed_indices = np.array(hashed_indices, dtype=np.intp)
+        if hashed_indices:
+            self._hashes = np.frombuffer(b''.join([results[i][2] for i in hashed_indices]), dtype='>u8')
+        else:
+            self._hashes = np.empty(0, dtype=np.uint64)
+
+    def get_same_path(self, image_path: pathlib.Path) -> list[tuple[int, str, bytes | None]]:
+        """Returns the rows of images at the given path."""
+        return [self._results[i] for i in self._indices_by_path.get(str(image_path), [])]
+
+    def get_similar(self, image_hash: int, image_path: pathlib.Path) -> list[tuple[int, str, bytes]]:
+        """Compares a hash to all hashes at once.
+
+        :param image_hash: The hash to compare.
+        :param image_path: Images at this path are ignored.
+        :return: The rows of images with a different path whose hash is similar.
+        """
+        if len(self._hashes) == 0:
+            return []
+        distances = utils.image.hash_distances(image_hash, self._hashes)
+        indices = self._hashed_indices[distances <= utils.image.HASH_DISTANCE_THRESHOLD]
+        path = str(image_path)
+        return [self._results[i] for i in indices if self._results[i][1] != path]
+
+
 class ImageDao(DAO):
     """This class manages images."""
 
@@ -107,8 +148,8 @@ class ImageDao(DAO):
         cursor.close()
         return result is not None
 
-    def get_similar_images(self, image_path: pathlib.Path) \
-            -> list[tuple[model.Image, int, float, bool]] | None:
+    def get_similar_images(self, image_path: pathlib.Path, image_hash: int = None,
+                           snapshot: ImagesSnapshot = None) -> list[tuple[model.Image, int, float, bool]] | None:
         """Returns a list of all images that may be similar to the given one.
 
         Two images are considered similar if the Hamming distance between their respective hashes is ≤ 10
@@ -119,23 +160,81 @@ class ImageDao(DAO):
         @see IMG_REGISTERED, IMG_SIMILAR, IMG_NOT_REGISTERED
 
         :param image_path: Path to the image.
+        :param image_hash: Optional. The image’s hash if already known.
+        :param snapshot: Optional. Registered images to search into, as returned by get_images_snapshot.
+            If absent, images are fetched from the database.
         :return: A list of candidate images with their Hamming distance, confidence score and a boolean indicating
             whether the paths are the same (True) or not (False).
         """
-        image_hash = utils.image.get_hash(image_path)
         if image_hash is None:
+            image_hash = utils.image.get_hash(image_path)
+        if image_hash is None:
+            return None
+        if snapshot is None:
+            snapshot = self._get_snapshot(image_path)
+        if snapshot is None:
             return None
-        images = []
-        for registered_image in self.get_images(sp.true):
-            if image_path == registered_image.path:
-                images.append((registered_image, 0, 1.0, True))
-            elif registered_image.hash is not None \
-                    and utils.image.compare_hashes(image_hash, registered_image.hash)[2]:
-                images.append(
-                    (registered_image, *utils.image.compare_hashes(image_hash, registered_image.hash)[:2], False))
+        images = [(self._get_image(result), 0, 1.0, True) for result in snapshot.get_same_path(image_path)]
+        # Image objects are only built for similar images
+        for result in snapshot.get_similar(image_hash, image_path):
+            registered_image = self._get_image(result)
+            dist, confidence, _ = utils.image.compare_hashes(image_hash, registered_image.hash)
+            images.append((registered_image, dist, confidence, False))
         # Sort by: sameness (desc), distance (asc), confidence (desc), path (normal)
         return sorted(images, key=lambda e: (not e[3], e[1], -e[2], e[0]))
 
+    def has_similar_images(self, image_path: pathlib.Path, image_hash: int = None,
+                           snapshot: ImagesSnapshot = None) -> bool | None:
+        """Tells whether any image with a different path is similar to the given one. No image object is created.
+        Without a snapshot, the hashes of all registered images are fetched from the database.
+
+        :param image_path: Path to the image.
+        :param image_hash: Optional. The image’s hash if already known.
+        :param snapshot: Optional. Registered images to search into, as returned by get_images_snapshot.
+            Passing the same snapshot for several images avoids querying the database each time.
+        :return: True if there is at least one similar image, None if the image could not be hashed or an error
+            occured.
+        """
+        if image_hash is None:
+            image_hash = utils.image.get_hash(image_path)
+        if image_hash is None:
+            return None
+        if snapshot is None:
+            snapshot = self._get_snapshot(image_path)
+        if snapshot is None:
+            return None
+        return len(snapshot.get_similar(image_hash, image_path)) != 0
+
+    def get_images_snapshot(self) -> ImagesSnapshot | None:
+        """Returns a snapshot of all registered images. It can be passed to get_similar_images to look up the similar
+        images of several images without querying the database each time.
+
+        :return: The snapshot or None if an error occured.
+        """
+        return self._get_snapshot()
+
+    def _get_snapshot(self, image_path: pathlib.Path = None) -> ImagesSnapshot | None:
+        """Fetches registered images.
+
+        :param image_path: If specified, only images at this path or with a hash are fetched.
+        :return: The snapshot or None if an error occured.
+        """
+        cursor = self._connection.cursor()
+        try:
+            if image_path is not None:
+                cursor.execute('SELECT id, path, hash FROM images WHERE hash IS NOT NULL OR path = ?',
+                               (str(image_path),))
+            else:
+                cursor.execute('SELECT id, path, hash FROM images')
+        except sqlite3.Error as e:
+            logger.exception(e)
+            cursor.close()
+            return None
+        else:
+            results = cursor.fetchall()
+            cursor.close()
+            return ImagesSnapshot(results)
+
     def add_image(self, image_path: pathlib.Path, tags: list[model.Tag]) -> bool:
         """Adds an image.
 
@@ -163,26 +262,30 @@ class ImageDao(DAO):
             self._connection.commit()
             return True
 
-    def update_image(self, image_id: int, new_path: pathlib.Path, new_hash: int | None) -> bool:
-        """Sets the path of the given image.
+    def update_image(self, image_id: int, new_path: pathlib.Path, new_hash: int | None,
+                     tags: list[model.Tag] = None) -> bool:
+        """Sets the path of the given image. If tags are given, they are set in the same transaction.
 
         :param image_id: Image’s ID.
         :param new_path: The new path.
         :param new_hash: The new hash.
+        :param tags: Optional. The tags to set.
         :return: True if the image was updated.
         """
-        cursor = self._connection.cursor()
         try:
-            cursor.execute(
+            self._connection.execute('BEGIN')
+            self._connection.execute(
                 'UPDATE images SET path = ?, hash = ? WHERE id = ?',
                 (str(new_path), self.encode_hash(new_hash) if new_hash is not None else None, image_id)
             )
+            if tags is not None:
+                self._set_image_tags(image_id, tags)
         except sqlite3.Error as e:
             logger.exception(e)
-            cursor.close()
+            self._connection.rollback()
             return False
         else:
-            cursor.close()
+            self._connection.commit()
             return True
 
     def update_image_tags(self, image_id: int, tags: list[model.Tag]) -> bool:
@@ -194,10 +297,7 @@ class ImageDao(DAO):
         """
         try:
             self._connection.execute('BEGIN')
-            self._connection.execute('DELETE FROM image_tag WHERE image_id = ?', (image_id,))
-            for tag in tags:
-                tag_id = self._insert_tag_if_not_exists(tag)
-                self._connection.execute('INSERT INTO image_tag(image_id, tag_id) VALUES(?, ?)', (image_id, tag_id))
+            self._set_image_tags(image_id, tags)
         except sqlite3.Error as e:
             logger.exception(e)
             self._connection.rollback()
@@ -231,6 +331,17 @@ class ImageDao(DAO):
             hash=self.decode_hash(result[2]) if result[2] is not None else None
         )
 
+    def _set_image_tags(self, image_id: int, tags: list[model.Tag]):
+        """Replaces the tags of the given image. Must be called inside a transaction.
+
+        :param image_id: Image’s ID.
+        :param tags: The tags to set.
+        """
+        self._connection.execute('DELETE FROM image_tag WHERE image_id = ?', (image_id,))
+        for tag in tags:
+            tag_id = self._insert_tag_if_not_exists(tag)
+            self._connection.execute('INSERT INTO image_tag(image_id, tag_id) VALUES(?, ?)', (image_id, tag_id))
+
     def _insert_tag_if_not_exists(self, tag: model.Tag) -> int:
         """Inserts the given tag if it does not already exist.
 
@@ -30,7 +30,7 @@ class Application(QtW.QMainWindow):
         )
 
         self._image_dao = da.ImageDao(config.CONFIG.database_path)
-        self._tags_dao = da.TagsDao(config.CONFIG.database_path)
+        self._tags_dao = da.TagsDao(config.CONFIG.database_path, shared_with=self._image_dao)
         self._search_thread = None
 
         self._operations_dialog_state: dialogs.OperationsDialog.State | None = None
@@ -574,6 +574,7 @@ class Application(QtW.QMainWindow):
 
             config.load_config()
             app = QtW.QApplication(sys.argv)
+            QtG.QPixmapCache.setCacheLimit(constants.PIXMAP_CACHE_SIZE)
             success, message = da.update_database_if_needed()
             if success is None:  # Update cancelled
                 if message:
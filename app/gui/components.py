@@ -217,37 +217,71 @@ class TagTree(QtW.QTreeWidget):
 class Canvas(QtW.QGraphicsView):
     """This class is a canvas in which images can be displayed."""
 
-    def __init__(self, keep_border: bool = True, show_errors: bool = True, parent: QtW.QWidget = None):
+    def __init__(self, keep_border: bool = True, show_errors: bool = True, max_size: int = None,
+                 asynchronous: bool = False, parent: QtW.QWidget = None):
         """Creates an empty canvas with no image.
 
         :param keep_border: If true the default border and bakground will be kept;
                             otherwise they will both be transparent unless there is no image.
         :param show_errors: If true a popup will appear when an image cannot be loaded.
+        :param max_size: If set, still images larger than max_size×max_size pixels are decoded directly at a size
+                         that fits into this square.
+        :param asynchronous: If true still images that are not cached are decoded in a background thread
+                             while a placeholder is displayed.
         :param parent: This widget’s parent.
         """
         super().__init__(parent=parent)
         self._image = None
         self._keep_border = keep_border
         self._show_errors = show_errors
+        self._max_size = max_size
+        self._asynchronous = asynchronous
+        # Incremented on each call to set_image to discard results of outdated background loads
+        self._load_token = 0
+        # Path and modification date of the displayed file
+        self._current_file: tuple[pathlib.Path, int] | None = None
 
     def set_image(self, image_path: pathlib.Path):
         """Sets the image to display.
 
         :param image_path: Path to the image.
         """
+        try:
+            mtime = image_path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime is not None and self._current_file == (image_path, mtime):
+            return  # Already displayed or being loaded
+        self._current_file = (image_path, mtime) if mtime is not None else None
+        self._load_token += 1
         self.setScene(QtW.QGraphicsScene())
-        if image_path.exists():
+        if mtime is not None:
             ext = utils.files.get_extension(image_path.name, keep_dot=True)
-            self._image = QtG.QPixmap(str(image_path), format=ext)
-            if QtG.QImageReader(str(image_path)).imageCount() <= 1:
-                self.scene().addPixmap(self._image)
-            else:
-                gif_anim = QtW.QLabel()  # Must not set parent
-                movie = QtG.QMovie(str(image_path), format=ext.encode(encoding='UTF-8'), parent=gif_anim)
-                gif_anim.setMovie(movie)
-                movie.start()
-                self.scene().addWidget(gif_anim)
-            self.fit()
+            animated = QtG.QImageReader(str(image_path)).imageCount() > 1
+            # Decoded images are shared through Qt’s global cache, the modification date invalidates stale entries
+            cache_key = f'{image_path}:{mtime}:{self._max_size}'
+            self._image = QtG.QPixmapCache.find(cache_key)
+            if self._image is None or self._image.isNull():
+                if self._asynchronous and not animated:
+                    self._image = None
+                    self.scene().addText(_t('canvas.loading'))
+                    loader = _ImageLoaderThread(self._load_token, image_path, cache_key, self._max_size)
+                    loader.loaded.connect(self._on_image_loaded)
+                    _ImageLoaderThread.start_loader(loader)
+                else:
+                    self._image = QtG.QPixmap.fromImage(_read_image(image_path, self._max_size, animated))
+                    if not self._image.isNull():
+                        QtG.QPixmapCache.insert(cache_key, self._image)
+            if self._image is not None:  # None while the image is decoded in the background
+                if not animated:
+                    self.scene().addPixmap(self._image)
+                else:
+                    gif_anim = QtW.QLabel()  # Must not set parent
+                    movie = QtG.QMovie(str(image_path), format=ext.encode(encoding='UTF-8'), parent=gif_anim)
+                    gif_anim.setMovie(movie)
+                    movie.start()
+                    self.scene().addWidget(gif_anim)
+                self.fit()
             border = '0'
         else:
             if self._show_errors:
@@ -259,6 +293,17 @@ class Canvas(QtW.QGraphicsView):
         if not self._keep_border:
             self.setStyleSheet(f'border: {border}')
 
+    def _on_image_loaded(self, token: int, cache_key: str, image: QtG.QImage):
+        """Displays an image decoded in the background, unless another image was set in the meantime."""
+        if token != self._load_token:
+            return
+        self._image = QtG.QPixmap.fromImage(image)
+        if not self._image.isNull():
+            QtG.QPixmapCache.insert(cache_key, self._image)
+        self.setScene(QtW.QGraphicsScene())
+        self.scene().addPixmap(self._image)
+        self.fit()
+
     def fit(self):
         """Fits the image into the canvas."""
         if self._image:
@@ -276,6 +321,51 @@ class Canvas(QtW.QGraphicsView):
         return super().resizeEvent(event)
 
 
+def _read_image(image_path: pathlib.Path, max_size: int | None, animated: bool) -> QtG.QImage:
+    """Decodes the given image. Can be called from any thread.
+
+    :param image_path: Path to the image.
+    :param max_size: If set, still images larger than max_size×max_size pixels are scaled down while decoding.
+    :param animated: Whether the image has several frames.
+    :return: The decoded image, null if it could not be read.
+    """
+    reader = QtG.QImageReader(str(image_path))
+    if max_size is not None and not animated:
+        size = reader.size()
+        if size.isValid() and (size.width() > max_size or size.height() > max_size):
+            reader.setScaledSize(size.scaled(max_size, max_size, QtC.Qt.KeepAspectRatio))
+    return reader.read()
+
+
+class _ImageLoaderThread(QtC.QThread):
+    """Decodes an image in the background. QImage is used as QPixmap cannot be created outside the GUI thread."""
+    loaded = QtC.pyqtSignal(int, str, QtG.QImage)
+
+    # Running loaders, they must stay referenced until finished even if their canvas was deleted
+    _running: set[_ImageLoaderThread] = set()
+
+    def __init__(self, token: int, image_path: pathlib.Path, cache_key: str, max_size: int | None):
+        super().__init__()
+        self._token = token
+        self._image_path = image_path
+        self._cache_key = cache_key
+        self._max_size = max_size
+
+    @classmethod
+    def start_loader(cls, loader: _ImageLoaderThread):
+        """Starts the given loader and keeps a reference to it until it finishes."""
+        cls._running.add(loader)
+        loader.finished.connect(loader._on_finished)
+        loader.start()
+
+    def _on_finished(self):
+        self.wait()
+        self._running.discard(self)
+
+    def run(self):
+        self.loaded.emit(self._token, self._cache_key, _read_image(self._image_path, self._max_size, False))
+
+
 class EllipsisLabel(QtW.QLabel):
     """This custom label adds an ellipsis (…) if the text doesn’t fit."""
 
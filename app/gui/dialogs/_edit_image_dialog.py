@@ -1,17 +1,21 @@
+from __future__ import annotations
+
 import collections
+import dataclasses
+import itertools
 import pathlib
 import re
-import shutil
 import typing as typ
 
 import PyQt5.QtCore as QtC
 import PyQt5.QtGui as QtG
 import PyQt5.QtWidgets as QtW
+from PyQt5 import sip
 
 from app import config, data_access as da, model, utils
 from app.i18n import translate as _t
 from . import _dialog_base, _edit_tags_dialog, _similar_images_dialog
-from .. import components
+from .. import components, threads
 
 
 class EditImageDialog(_dialog_base.Dialog):
@@ -25,6 +29,11 @@ class EditImageDialog(_dialog_base.Dialog):
         'dialog.edit_image.title_add',
         'dialog.edit_image.title_replace',
     ]
+    # Text made only of untyped tags, those do not need any lookup in the database
+    _PLAIN_TAGS_PATTERN = re.compile(r'[\w\s]*')
+
+    # Read-only tags dialog shared by all instances
+    _tags_dialog: _edit_tags_dialog.EditTagsDialog | None = None
 
     def __init__(self, image_dao: da.ImageDao, tags_dao: da.TagsDao, parent: QtW.QWidget = None, mode: int = EDIT,
                  show_skip: bool = False):
@@ -43,10 +52,15 @@ class EditImageDialog(_dialog_base.Dialog):
 
         self._mode = mode
         self._show_skip = show_skip
+        # Translated once, only the counters change between images
+        self._title_template = _t(self._TITLES[self._mode], index='{index}', total='{total}')
 
         self._index = -1
         self._images: list[model.Image] = []
-        self._tags: dict[int, list[model.Tag]] = {}
+        self._tags_strings: dict[int, str] = {}
+        # Parent directory and file name of each image, in the same order as self._images
+        self._dirnames: list[pathlib.Path] = []
+        self._basenames: list[str] = []
 
         self._image_dao = image_dao
         self._tags_dao = tags_dao
@@ -58,9 +72,22 @@ class EditImageDialog(_dialog_base.Dialog):
         self._destination: pathlib.Path | None = None
         self._image_to_replace: pathlib.Path | None = None
         self._tags_changed = False
-        self._similar_images: list[tuple[model.Image, float]] = []
-
-        self._tags_dialog = None
+        self._original_tags: frozenset[str] = frozenset()
+        self._original_tags_text = ''
+        # Last parsed text with the resulting tags and the labels of compound tags among them
+        self._parsed_tags: tuple[str, list[model.Tag], list[str]] | None = None
+        # Class of each tag label looked up so far
+        self._tag_classes: dict[str, type[model.Tag] | None] = {}
+        # Similar images of each already displayed image, by path
+        self._similar_images_cache: dict[pathlib.Path, list[tuple[model.Image, float]]] = {}
+        # Paths of images whose similar images are being fetched in the background
+        self._pending_similar_images: set[pathlib.Path] = set()
+        self._similar_images_thread: _SimilarImagesThread | None = None
+        # Hashes of registered images used to tell whether displayed images have similar ones,
+        # loaded on first use and dropped when images are added or replaced
+        self._images_snapshot: da.image_dao.ImagesSnapshot | None = None
+        # Images being moved in the background with the function that updates the database once done, by new path
+        self._pending_moves: dict[pathlib.Path, tuple[_MoveImageThread, typ.Callable[[], tuple[bool, str | None]]]] = {}
 
     def _init_body(self) -> QtW.QLayout:
         self.setGeometry(0, 0, 800, 600)
@@ -74,7 +101,7 @@ class EditImageDialog(_dialog_base.Dialog):
         self._image_path_lbl.setAlignment(QtC.Qt.AlignCenter)
         top_layout.addWidget(self._image_path_lbl)
 
-        self._canvas = components.Canvas(parent=self)
+        self._canvas = components.Canvas(asynchronous=True, parent=self)
         top_layout.addWidget(self._canvas)
 
         top_widget = QtW.QWidget(parent=self)
@@ -126,8 +153,7 @@ class EditImageDialog(_dialog_base.Dialog):
 
         bottom_layout.addLayout(buttons_layout)
 
-        self._tags_input = _CustomTextEdit(self, parent=self)
-        self._tags_input.validated.connect(lambda: self._ok_btn.click())
+        self._tags_input = _CustomTextEdit(parent=self)
         self._tags_input.textChanged.connect(self._text_changed)
         if self._mode == EditImageDialog.REPLACE:
             self._tags_input.setDisabled(True)
@@ -146,6 +172,7 @@ class EditImageDialog(_dialog_base.Dialog):
         return layout
 
     def _init_buttons(self) -> list[QtW.QAbstractButton]:
+        self._tags_input.validated.connect(self._ok_btn.click)
         if self._mode == EditImageDialog.REPLACE:
             self._ok_btn.setDisabled(True)
 
@@ -161,9 +188,26 @@ class EditImageDialog(_dialog_base.Dialog):
         return []
 
     def _show_tags_dialog(self):
-        if self._tags_dialog is None:
-            self._tags_dialog = _edit_tags_dialog.EditTagsDialog(self._tags_dao, editable=False, parent=self)
-        self._tags_dialog.show()
+        self._get_tags_dialog(self._tags_dao, parent=self).show()
+
+    @classmethod
+    def _get_tags_dialog(cls, tags_dao: da.TagsDao, parent: QtW.QWidget) -> _edit_tags_dialog.EditTagsDialog:
+        """Returns the read-only tags dialog, creating it on first use. The same dialog is reused by all instances of
+        this class; it is attached to the given parent and its content is refreshed if it was hidden.
+
+        :param tags_dao: Tags DAO instance.
+        :param parent: The widget the dialog should be attached to.
+        :return: The tags dialog.
+        """
+        dialog = cls._tags_dialog
+        if dialog is None or sip.isdeleted(dialog):
+            dialog = cls._tags_dialog = _edit_tags_dialog.EditTagsDialog(tags_dao, editable=False, parent=parent)
+        else:
+            if dialog.parent() is not parent:
+                dialog.setParent(parent, dialog.windowFlags())
+            if not dialog.isVisible():
+                dialog.refresh()
+        return dialog
 
     def _open_image_directory(self):
         """Shows the current image in the system’s file explorer."""
@@ -177,9 +221,35 @@ class EditImageDialog(_dialog_base.Dialog):
         :param tags: The tags for each image.
         """
         self._index = 0
-        self._images = sorted(images)
-        self._tags = tags
+        # Only the first image is needed right away, the others are sorted once the dialog is displayed
+        self._images = list(images)
+        if self._images:
+            first = min(range(len(self._images)), key=self._images.__getitem__)
+            self._images[0], self._images[first] = self._images[first], self._images[0]
+        self._cache_paths()
+        self._tags_strings = {image_id: self._join_tags(image_tags) for image_id, image_tags in tags.items()}
         self._set(self._index)
+        if len(self._images) > 2 and not self._is_sorted(self._images):
+            QtC.QTimer.singleShot(0, self._sort_remaining_images)
+        # Images added in add mode would make prefetched results stale
+        if self._mode == EditImageDialog.EDIT and len(self._images) > 1:
+            self._prefetch_similar_images(self._images[1:])
+
+    @staticmethod
+    def _is_sorted(images: list[model.Image]) -> bool:
+        """Tells whether the given images are in ascending order, without copying the list."""
+        return not any(image2 < image1 for image1, image2 in itertools.pairwise(images))
+
+    def _sort_remaining_images(self):
+        """Sorts the images that have not been displayed yet."""
+        start = self._index + 1
+        self._images[start:] = sorted(self._images[start:])
+        self._cache_paths()
+
+    def _cache_paths(self):
+        """Caches the parent directory and file name of each image."""
+        self._dirnames = [image.path.parent for image in self._images]
+        self._basenames = [image.path.name for image in self._images]
 
     def set_image(self, image: model.Image, tags: list[model.Tag]):
         """Sets the image to display.
@@ -200,30 +270,19 @@ class EditImageDialog(_dialog_base.Dialog):
         # Calculate hash if in add mode
         if self._mode == EditImageDialog.ADD:
             hash_ = utils.image.get_hash(image.path)
-            self._images[index] = image = model.Image(id=image.id, path=image.path, hash=hash_)
+            self._images[index] = image = dataclasses.replace(image, hash=hash_)
 
-        self._image_path_lbl.setText(str(image.path))
-        self._image_path_lbl.setToolTip(str(image.path))
+        self._load_image_view(image)
 
-        if self._mode == EditImageDialog.REPLACE:
-            self._tags_input.setDisabled(False)
         if self._mode != EditImageDialog.ADD:
-            tags = []
-            if image.id in self._tags:
-                tags = self._tags[image.id]
-            self._set_tags(tags, clear_undo_redo=True)
-        if self._mode == EditImageDialog.REPLACE:
-            self._tags_input.setDisabled(True)
+            # Programmatic changes do not require the field to be enabled
+            tags_string = self._tags_strings.get(image.id, '')
+            self._original_tags = frozenset(tags_string.split())
+            self._original_tags_text = tags_string
+            self._set_tags_string(tags_string, clear_undo_redo=True)
         self._tags_changed = False
 
-        self._canvas.set_image(image.path)
-
-        similar_images = self._image_dao.get_similar_images(image.path) or []
-        self._similar_images = [(image, score) for image, _, score, same_path in similar_images if not same_path]
-        if self._similar_images:
-            self._similarities_btn.show()
-        else:
-            self._similarities_btn.hide()
+        self._update_similar_images()
 
         if self._index == len(self._images) - 1:
             if self._skip_btn:
@@ -234,19 +293,104 @@ class EditImageDialog(_dialog_base.Dialog):
 
         self.setWindowTitle(self._get_title())
 
+    def _load_image_view(self, image: model.Image):
+        """Displays the given image and its path."""
+        self._image_path_lbl.setText(str(image.path))
+        self._image_path_lbl.setToolTip(str(image.path))
+        self._canvas.set_image(image.path)
+
     def _set_tags(self, tags: list[model.Tag], clear_undo_redo: bool = True):
-        self._tags_input.clear()
-        self._tags_input.insertPlainText(' '.join(sorted([tag.raw_label() for tag in tags])))
+        self._set_tags_string(self._join_tags(tags), clear_undo_redo=clear_undo_redo)
+
+    def _set_tags_string(self, tags: str, clear_undo_redo: bool = True):
         if clear_undo_redo:
-            self._tags_input.document().clearUndoRedoStacks()
+            # Programmatic load: replace the whole text at once without notifying listeners
+            if self._tags_input.toPlainText() == tags:
+                self._tags_input.document().clearUndoRedoStacks()
+            else:
+                with QtC.QSignalBlocker(self._tags_input):
+                    self._tags_input.setPlainText(tags)
+        else:
+            self._tags_input.clear()
+            self._tags_input.insertPlainText(tags)
+
+    @staticmethod
+    def _join_tags(tags: list[model.Tag]) -> str:
+        """Returns the sorted raw labels of the given tags, separated by spaces."""
+        return ' '.join(sorted([tag.raw_label() for tag in tags]))
 
     def _next(self):
         """Goes to the next image."""
         self._index += 1
         self._set(self._index)
 
+    def _update_similar_images(self):
+        """Shows the similarities button if the current image has similar images. The button stays hidden while the
+        similar images are being fetched in the background. The actual list is only computed when the button is
+        clicked, unless it was already available."""
+        image = self._images[self._index]
+        if image.path in self._similar_images_cache:
+            has_similar = len(self._similar_images_cache[image.path]) != 0
+        elif image.path in self._pending_similar_images:
+            has_similar = False
+        else:
+            if self._images_snapshot is None:
+                self._images_snapshot = self._image_dao.get_images_snapshot()
+            # Only compares hashes in memory, without querying the database
+            has_similar = self._image_dao.has_similar_images(image.path, self._get_known_hash(image),
+                                                             snapshot=self._images_snapshot)
+        if has_similar:
+            self._similarities_btn.show()
+        else:
+            self._similarities_btn.hide()
+
+    def _prefetch_similar_images(self, images: list[model.Image]):
+        """Fetches the similar images of the given images in a background thread."""
+        self._stop_prefetch()
+        self._pending_similar_images = {image.path for image in images}
+        self._similar_images_thread = _SimilarImagesThread(images)
+        self._similar_images_thread.progress_signal.connect(self._on_similar_images_fetched)
+        self._similar_images_thread.start()
+
+    def _on_similar_images_fetched(self, _, data: tuple[pathlib.Path, list[tuple[model.Image, float]]], status: int):
+        path, similar_images = data
+        if path not in self._pending_similar_images:  # Prefetch was stopped
+            return
+        self._pending_similar_images.remove(path)
+        if status == _SimilarImagesThread.STATUS_SUCCESS:
+            self._similar_images_cache[path] = similar_images
+        if path == self._images[self._index].path:
+            self._update_similar_images()
+
+    def _stop_prefetch(self):
+        """Stops the background fetching of similar images, if running."""
+        self._pending_similar_images.clear()
+        if self._similar_images_thread is not None:
+            self._similar_images_thread.cancel()
+            self._similar_images_thread.wait()
+            self._similar_images_thread = None
+
+    def _get_similar_images(self, image: model.Image) -> list[tuple[model.Image, float]]:
+        """Returns the images that are similar to the given one, excluding itself. Results are cached.
+
+        :param image: The image to get similar images of.
+        :return: The similar images with their confidence score.
+        """
+        if image.path not in self._similar_images_cache:
+            similar_images = self._image_dao.get_similar_images(image.path, self._get_known_hash(image)) or []
+            self._similar_images_cache[image.path] = [(similar_image, score)
+                                                      for similar_image, _, score, same_path in similar_images
+                                                      if not same_path]
+        return self._similar_images_cache[image.path]
+
+    def _get_known_hash(self, image: model.Image) -> int | None:
+        """Returns the hash of the given image if it matches its file. In replace mode, the hash is the one of the
+        image being replaced."""
+        return image.hash if self._mode != EditImageDialog.REPLACE else None
+
     def _on_show_similarities_dialog(self):
-        dialog = _similar_images_dialog.SimilarImagesDialog(self._similar_images, self._image_dao, self._tags_dao,
+        similar_images = self._get_similar_images(self._images[self._index])
+        dialog = _similar_images_dialog.SimilarImagesDialog(similar_images, self._image_dao, self._tags_dao,
                                                             parent=self)
         dialog.set_on_close_action(self._on_similarities_dialog_closed)
         dialog.show()
@@ -273,8 +417,11 @@ class EditImageDialog(_dialog_base.Dialog):
                     return
                 self._destination = destination
                 self._ok_btn.setDisabled(False)
-                self._images[0] = model.Image(id=img.id, path=self._destination, hash=img.hash)
-                self._set(0)
+                self._images[0] = image = dataclasses.replace(img, path=self._destination)
+                self._cache_paths()
+                # Tags, completer and title stay the same, only the displayed file changes
+                self._load_image_view(image)
+                self._update_similar_images()
             else:
                 self._destination = destination
             key = 'target_image' if self._mode == EditImageDialog.REPLACE else 'target_path'
@@ -285,26 +432,46 @@ class EditImageDialog(_dialog_base.Dialog):
         self._tags_changed = True
 
     def _get_tags(self) -> list[model.Tag]:
-        return [self._tags_dao.create_tag_from_string(t) for t in self._tags_input.toPlainText().split()]
+        return self._parse_tags()[0]
+
+    def _parse_tags(self) -> tuple[list[model.Tag], list[str]]:
+        """Parses the tags text in a single pass.
+
+        :return: The tags and the labels of those that are compound tags.
+        :raise ValueError: If a tag is invalid.
+        """
+        text = self._tags_input.toPlainText()
+        # The text is parsed once for both validation and application
+        if self._parsed_tags is not None and self._parsed_tags[0] == text:
+            return self._parsed_tags[1:]
+        plain = self._PLAIN_TAGS_PATTERN.fullmatch(text)
+        tags = []
+        compound_tags = []
+        for token in text.split():
+            tag = model.Tag(0, token) if plain else self._tags_dao.create_tag_from_string(token)
+            tags.append(tag)
+            if tag.label not in self._tag_classes:
+                self._tag_classes[tag.label] = self._tags_dao.get_tag_class(tag.label)
+            if self._tag_classes[tag.label] == model.CompoundTag:
+                compound_tags.append(tag.label)
+        self._parsed_tags = (text, tags, compound_tags)
+        return tags, compound_tags
 
     @staticmethod
     def _get_duplicate_tags(tags: list[model.Tag]) -> list[str]:
         return [t for t, c in collections.Counter([t.label for t in tags]).items() if c > 1]
 
-    def _get_compound_tags(self, tags: list[model.Tag]) -> list[str]:
-        return [t.label for t in tags if self._tags_dao.get_tag_class(t.label) == model.CompoundTag]
-
     def _get_error(self) -> str | None:
         try:
-            tags = self._get_tags()
+            tags, compound_tags = self._parse_tags()
         except ValueError as e:
             error = re.search('"(.+)"', str(e))[1]
             return _t('dialog.edit_image.error.invalid_tag_format', error=error)
         else:
             if len(tags) == 0:
                 return _t('dialog.edit_image.error.no_tags')
-            elif t := self._get_compound_tags(tags):
-                return _t('dialog.edit_image.error.compound_tags_disallowed', tags='\n'.join(t))
+            elif compound_tags:
+                return _t('dialog.edit_image.error.compound_tags_disallowed', tags='\n'.join(compound_tags))
             elif t := self._get_duplicate_tags(tags):
                 return _t('dialog.edit_image.error.duplicate_tags', tags='\n'.join(t))
             else:
@@ -317,7 +484,7 @@ class EditImageDialog(_dialog_base.Dialog):
         tags = self._get_tags()
 
         image = self._images[self._index]
-        new_path = self._get_new_path(image)
+        new_path = self._get_new_path()
 
         if self._mode == EditImageDialog.ADD:
             ok, error = self._add(image, tags, new_path)
@@ -326,6 +493,18 @@ class EditImageDialog(_dialog_base.Dialog):
         else:
             ok, error = self._replace()
 
+        # Applied tags may have been created
+        self._tag_classes.clear()
+        if self._mode != EditImageDialog.EDIT:
+            # Added or replaced images are missing from the snapshot
+            self._images_snapshot = None
+        if new_path:
+            # Cached and prefetched results may reference the old path
+            self._stop_prefetch()
+            self._similar_images_cache.clear()
+        else:
+            self._similar_images_cache.pop(image.path, None)
+
         if ok:
             close = self._index == len(self._images) - 1
             if not close:
@@ -337,21 +516,21 @@ class EditImageDialog(_dialog_base.Dialog):
 
         return close
 
-    def _get_new_path(self, image: model.Image) -> pathlib.Path | None:
-        """Returns the new image path. It is obtained by appending the image name to the destination path.
+    def _get_new_path(self) -> pathlib.Path | None:
+        """Returns the new path of the current image. It is obtained by appending the image name to the destination
+        path.
 
-        :param image: The image to move.
         :return: The new path.
         """
         if self._mode != EditImageDialog.REPLACE and self._destination is not None \
-                and image.path.parent != self._destination:
-            return self._destination / image.path.name
+                and self._dirnames[self._index] != self._destination:
+            return self._destination / self._basenames[self._index]
         else:
             return None
 
     def _add(self, image: model.Image, tags: list[model.Tag], new_path: pathlib.Path | None) \
             -> tuple[bool, str | None]:
-        """Adds an image to the database.
+        """Adds an image to the database. If the image has to be moved, it is added once moved in the background.
 
         :param image: The image to add.
         :param tags: Image’s tags.
@@ -359,19 +538,19 @@ class EditImageDialog(_dialog_base.Dialog):
         :return: True if everything went well.
         """
         if image.path.exists():
-            ok, error = True, None
+            def add() -> tuple[bool, str | None]:
+                return (self._image_dao.add_image(image.path if new_path is None else new_path, tags),
+                        _t('dialog.edit_image.error.image_not_added'))
+
             if new_path:
-                ok, error = self._move_image(image.path, new_path)
-            if ok:
-                ok = self._image_dao.add_image(image.path if new_path is None else new_path, tags)
-                error = _t('dialog.edit_image.error.image_not_added')
-            return ok, error
+                return self._move_image_async(image.path, new_path, add)
+            return add()
         else:
             return False, _t('dialog.edit_image.error.file_does_not_exists')
 
     def _edit(self, image: model.Image, tags: list[model.Tag], new_path: pathlib.Path | None) \
             -> tuple[bool, str | None]:
-        """Edits an image from the database.
+        """Edits an image from the database. If the image has to be moved, it is updated once moved in the background.
 
         :param image: The image to edit.
         :param tags: Image’s tags.
@@ -379,18 +558,73 @@ class EditImageDialog(_dialog_base.Dialog):
         :return: True if everything went well.
         """
         if image.path.exists():
-            ok, error = True, None
+            # Edits that leave the same set of tags do not need to be written
+            tags_changed = (self._tags_changed
+                            and self._tags_input.toPlainText() != self._original_tags_text
+                            and frozenset(t.raw_label() for t in tags) != self._original_tags)
             if new_path:
-                ok, error = self._move_image(image.path, new_path)
-            if ok:
-                if self._tags_changed:
-                    ok = self._image_dao.update_image_tags(image.id, tags)
-                if ok and new_path:
-                    ok = self._image_dao.update_image(image.id, new_path, image.hash)
-            return ok, error or _t('dialog.edit_image.error.changes_not_applied')
+                def update() -> tuple[bool, str | None]:
+                    # Path and tags are updated in a single transaction
+                    ok_ = self._image_dao.update_image(image.id, new_path, image.hash,
+                                                       tags=tags if tags_changed else None)
+                    if not ok_:
+                        # Put the file back where the database expects it
+                        self._move_image(new_path, image.path)
+                    return ok_, _t('dialog.edit_image.error.changes_not_applied')
+
+                return self._move_image_async(image.path, new_path, update)
+            ok = True
+            if tags_changed:
+                ok = self._image_dao.update_image_tags(image.id, tags)
+            return ok, _t('dialog.edit_image.error.changes_not_applied')
         else:
             return False, _t('dialog.edit_image.error.file_does_not_exists')
 
+    def _move_image_async(self, path: pathlib.Path, new_path: pathlib.Path,
+                          on_moved: typ.Callable[[], tuple[bool, str | None]]) -> tuple[bool, str | None]:
+        """Moves an image in a background thread so that the next image can be displayed right away.
+
+        :param path: Image’s path.
+        :param new_path: Image’s new path.
+        :param on_moved: Function that updates the database once the image has been moved.
+            It returns the same values as this method.
+        :return: True if the move could be started, false and the reason otherwise.
+        """
+        if new_path in self._pending_moves:  # Another image is still being moved to the same path
+            return False, _t('dialog.edit_image.error.file_already_exists')
+        if error := self._check_move(path, new_path):
+            return False, error
+        thread = _MoveImageThread(path, new_path)
+        self._pending_moves[new_path] = (thread, on_moved)
+        thread.progress_signal.connect(self._on_image_moved)
+        _MoveImageThread.start_move(thread)
+        return True, None
+
+    def _on_image_moved(self, _, data: tuple[pathlib.Path, pathlib.Path], __):
+        if entry := self._pending_moves.pop(data[1], None):  # Not already handled on close
+            self._finish_move(*entry)
+
+    def _finish_pending_moves(self):
+        """Waits for all background moves and applies their database updates."""
+        for new_path, entry in list(self._pending_moves.items()):
+            del self._pending_moves[new_path]
+            self._finish_move(*entry)
+
+    def _finish_move(self, thread: _MoveImageThread, on_moved: typ.Callable[[], tuple[bool, str | None]]):
+        """Updates the database after a background move, or reports why it failed."""
+        thread.wait()
+        if thread.failed:
+            ok, error = False, thread.error
+        else:
+            ok, error = on_moved()
+            # Moved images are only added to the database once moved
+            self._images_snapshot = None
+        if not ok:
+            utils.gui.show_error(
+                _t('dialog.edit_image.error.background_operation_failed', path=thread.path, error=error),
+                parent=self
+            )
+
     def _replace(self) -> tuple[bool, str | None]:
         """Replaces an image by another one. The old image is deleted. The new image will stay in its directory.
 
@@ -408,42 +642,130 @@ class EditImageDialog(_dialog_base.Dialog):
             return False, _t('dialog.edit_image.error.file_does_not_exists')
 
     @staticmethod
-    def _move_image(path: pathlib.Path, new_path: pathlib.Path) -> tuple[bool, str | None]:
+    def _check_move(path: pathlib.Path, new_path: pathlib.Path) -> str | None:
+        """Checks whether an image can be moved.
+
+        :param path: Image’s path.
+        :param new_path: Image’s new path.
+        :return: The reason the image cannot be moved, None if it can.
+        """
+        if new_path.exists():
+            return _t('dialog.edit_image.error.file_already_exists')
+        if not path.exists():
+            return _t('dialog.edit_image.error.file_does_not_exists')
+        return None
+
+    @classmethod
+    def _move_image(cls, path: pathlib.Path, new_path: pathlib.Path) -> tuple[bool, str | None]:
         """Moves an image to a specific directory.
 
         :param path: Image’s path.
         :param new_path: Path to the new directory.
         :return: True if the image was moved.
         """
-        if new_path.exists():
-            return False, _t('dialog.edit_image.error.file_already_exists')
-        if not path.exists():
-            return False, _t('dialog.edit_image.error.file_does_not_exist')
+        if error := cls._check_move(path, new_path):
+            return False, error
         try:
-            shutil.move(path, new_path)
+            utils.files.move_file(path, new_path)
         except OSError:
             return False, _t('dialog.edit_image.error.failed_to_move_file')
         else:
             return True, None
 
     def _get_title(self) -> str:
-        return _t(self._TITLES[self._mode], index=self._index + 1, total=len(self._images))
+        return self._title_template.format(index=self._index + 1, total=len(self._images))
 
     def closeEvent(self, event: QtG.QCloseEvent):
-        if self._tags_dialog is not None:
-            self._tags_dialog.close()
+        self._finish_pending_moves()
+        self._stop_prefetch()
+        dialog = EditImageDialog._tags_dialog
+        if dialog is not None and not sip.isdeleted(dialog) and dialog.parent() is self:
+            # Detach the shared dialog so that it is not deleted along with this one
+            dialog.hide()
+            dialog.setParent(None, dialog.windowFlags())
         super().closeEvent(event)
 
 
+class _SimilarImagesThread(threads.WorkerThread):
+    """Fetches the similar images of a list of images. Results are sent through the progress signal as
+    (path, similar images) tuples."""
+
+    def __init__(self, images: list[model.Image]):
+        super().__init__()
+        self._images = images
+
+    def run(self):
+        # Cannot use dialog’s as SQLite connections cannot be shared between threads
+        image_dao = da.ImageDao(config.CONFIG.database_path)
+        # Registered images are loaded once for the whole batch
+        snapshot = image_dao.get_images_snapshot()
+        images = sorted(self._images)
+        total = len(images)
+        for i, image in enumerate(images):
+            if self._cancelled:
+                break
+            if snapshot is not None:
+                similar_images = image_dao.get_similar_images(image.path, image.hash, snapshot=snapshot)
+            else:
+                similar_images = None
+            if similar_images is None:
+                status = self.STATUS_FAILED
+                similar_images = []
+            else:
+                status = self.STATUS_SUCCESS
+            self.progress_signal.emit(
+                (i + 1) / total,
+                (image.path, [(similar_image, score) for similar_image, _, score, same_path in similar_images
+                              if not same_path]),
+                status
+            )
+        image_dao.close()
+
+
+class _MoveImageThread(threads.WorkerThread):
+    """Moves an image file. The progress signal is emitted once with the (path, new path) tuple."""
+
+    # Running moves, they must stay referenced until finished as threads have no parent
+    _running: set[_MoveImageThread] = set()
+
+    def __init__(self, path: pathlib.Path, new_path: pathlib.Path):
+        super().__init__()
+        self._path = path
+        self._new_path = new_path
+
+    @classmethod
+    def start_move(cls, thread: _MoveImageThread):
+        """Starts the given thread and keeps a reference to it until it finishes."""
+        cls._running.add(thread)
+        thread.finished.connect(thread._on_finished)
+        thread.start()
+
+    def _on_finished(self):
+        self.wait()
+        self._running.discard(self)
+
+    @property
+    def path(self) -> pathlib.Path:
+        """The path of the image to move."""
+        return self._path
+
+    def run(self):
+        try:
+            utils.files.move_file(self._path, self._new_path)
+        except OSError:
+            self._error = _t('dialog.edit_image.error.failed_to_move_file')
+        self.progress_signal.emit(1, (self._path, self._new_path),
+                                  self.STATUS_FAILED if self.failed else self.STATUS_SUCCESS)
+
+
 class _CustomTextEdit(components.TranslatedPlainTextEdit):
     """Custom class to catch Ctrl+Enter events."""
     validated = QtC.pyqtSignal()
 
     _SEPARATORS = ' \n'
 
-    def __init__(self, dialog: EditImageDialog, parent: QtW.QWidget = None):
+    def __init__(self, parent: QtW.QWidget = None):
         super().__init__(parent=parent)
-        self._dialog = dialog
         self._completer = QtW.QCompleter(parent=self)
         self._completer.setCaseSensitivity(QtC.Qt.CaseInsensitive)
         self._completer.setFilterMode(QtC.Qt.MatchStartsWith)
@@ -491,12 +813,7 @@ class _CustomTextEdit(components.TranslatedPlainTextEdit):
         self._completer.popup().setCurrentIndex(self._completer.completionModel().index(0, 0))
 
     def _text_under_cursor(self) -> str:
-        text = self.toPlainText()
-        text_under_cursor = ''
-        i = self.textCursor().position() - 1
-
-        while i >= 0 and text[i] not in self._SEPARATORS:
-            text_under_cursor = text[i] + text_under_cursor
-            i -= 1
-
-        return text_under_cursor
+        # Only the current line needs to be extracted, lines are separated by a separator
+        cursor = self.textCursor()
+        text = cursor.block().text()[:cursor.positionInBlock()]
+        return text[max(text.rfind(c) for c in self._SEPARATORS) + 1:]
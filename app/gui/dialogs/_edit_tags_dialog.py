@@ -13,6 +13,8 @@ class EditTagsDialog(_dialog_base.Dialog):
     _TAG_TYPES_TAB = 0
     _COMPOUND_TAGS_TAB = 1
     _TAGS_TAB = 2
+    # Delay after the last edit before tables are checked
+    _INTEGRITY_CHECK_DELAY = 150  # In ms
 
     def __init__(self, tags_dao: data_access.TagsDao, editable: bool = True, parent: QtW.QWidget = None):
         """Creates a dialog.
@@ -23,6 +25,7 @@ class EditTagsDialog(_dialog_base.Dialog):
         """
         self._init = False
         self._editable = editable
+        self._tags_dao = tags_dao
 
         def type_cell_changed(row: int, col: int, _):
             if col == 1:
@@ -30,7 +33,7 @@ class EditTagsDialog(_dialog_base.Dialog):
                     tag_type = self._tabs[self._TAG_TYPES_TAB].get_value(row)
                     if tag_type is not None:
                         tab.update_type_label(tag_type)
-            self._check_integrity()
+            self._schedule_integrity_check()
 
         def types_deleted(deleted_types: list[model.TagType]):
             for tab in self._tabs[1:]:
@@ -40,15 +43,19 @@ class EditTagsDialog(_dialog_base.Dialog):
             _tabs.TagTypesTab(self, tags_dao, self._editable, selection_changed=self._selection_changed,
                               cell_changed=type_cell_changed, rows_deleted=types_deleted),
             _tabs.CompoundTagsTab(self, tags_dao, self._editable, selection_changed=self._selection_changed,
-                                  cell_changed=self._check_integrity, rows_deleted=self._check_integrity),
+                                  cell_changed=self._schedule_integrity_check, rows_deleted=self._check_integrity),
             _tabs.TagsTab(self, tags_dao, self._editable, selection_changed=self._selection_changed,
-                          cell_changed=self._check_integrity, rows_deleted=self._check_integrity)
+                          cell_changed=self._schedule_integrity_check, rows_deleted=self._check_integrity)
         )
 
         title = _t('dialog.edit_tags.title_edit') if self._editable else _t('dialog.edit_tags.title_readonly')
         mode = self.CLOSE if not self._editable else self.OK_CANCEL
         super().__init__(parent=parent, title=title, modal=self._editable, mode=mode)
         self._valid = True
+        self._integrity_timer = QtC.QTimer(parent=self)
+        self._integrity_timer.setSingleShot(True)
+        self._integrity_timer.setInterval(self._INTEGRITY_CHECK_DELAY)
+        self._integrity_timer.timeout.connect(self._check_integrity)
 
     def _init_body(self) -> QtW.QLayout:
         self.setGeometry(0, 0, 480, 400)
@@ -110,8 +117,9 @@ class EditTagsDialog(_dialog_base.Dialog):
     def _init_buttons(self) -> list[QtW.QAbstractButton]:
         if self._editable:
             def apply():
-                self._apply()
-                self._init_tabs()
+                if self._is_valid():
+                    self._apply()
+                    self._init_tabs()
 
             self._ok_btn.setEnabled(False)
             self._apply_btn = QtW.QPushButton(
@@ -125,11 +133,36 @@ class EditTagsDialog(_dialog_base.Dialog):
         else:
             return []
 
+    def refresh(self):
+        """Reloads the content of all tabs from the database."""
+        self._init_tabs()
+
     def _init_tabs(self):
+        # Rows are only loaded when a tab is shown for the first time,
+        # signals are blocked to not load tabs while they are being replaced
+        self._tabbed_pane.blockSignals(True)
         self._tabbed_pane.clear()
         for tab in self._tabs:
             tab.init()
             self._tabbed_pane.addTab(tab.table, tab.title)
+        self._tabbed_pane.blockSignals(False)
+        self._tab_changed(self._tabbed_pane.currentIndex())
+
+    def _load_tab(self, index: int):
+        """Loads the rows of the given tab if not already done.
+
+        :param index: Tab’s index.
+        """
+        tab = self._tabs[index]
+        if not tab.loaded:
+            tab.load()
+            if index != self._TAG_TYPES_TAB:
+                # Reflect the pending changes made to tag types before this tab was loaded
+                types_tab = self._tabs[self._TAG_TYPES_TAB]
+                for tag_type in types_tab.get_changed_values():
+                    tab.update_type_label(tag_type)
+                if deleted_types := types_tab.get_deleted_values():
+                    tab.delete_types(deleted_types)
 
     def _add_row(self):
         self._tabs[self._tabbed_pane.currentIndex()].add_row()
@@ -140,6 +173,7 @@ class EditTagsDialog(_dialog_base.Dialog):
         self._check_integrity()
 
     def _tab_changed(self, index: int):
+        self._load_tab(index)
         self._add_row_btn.setEnabled(self._tabs[index].addable)
         self._update_delete_row_btn(index)
 
@@ -169,10 +203,14 @@ class EditTagsDialog(_dialog_base.Dialog):
         self._search_field.setFocus()
 
     def _is_valid(self) -> bool:
+        if self._integrity_timer.isActive():  # Do not wait for the pending check
+            self._integrity_timer.stop()
+            self._check_integrity()
         return self._valid
 
     def _apply(self) -> bool:
-        ok = all(map(lambda t: t.apply(), self._tabs))
+        # Changes of all tabs are committed at once
+        ok = self._tags_dao.run_in_transaction(lambda: all(map(lambda t: t.apply(), self._tabs)))
         if not ok:
             utils.gui.show_error(_t('dialog.edit_tags.error.saving'), parent=self)
         else:
@@ -181,6 +219,12 @@ class EditTagsDialog(_dialog_base.Dialog):
 
         return True
 
+    def _schedule_integrity_check(self, *_):
+        """Checks the integrity of all tables once cells stop being edited for a short time. Parameters are ignored,
+        they are here only to conform to the Tab class constructor.
+        """
+        self._integrity_timer.start()
+
     def _check_integrity(self, *_):
         """Checks the integrity of all tables. Parameters are ignored, they are here only to conform to the Tab class
         constructor.
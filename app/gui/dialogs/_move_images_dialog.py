@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import pathlib
-import shutil
 
 import PyQt5.QtWidgets as QtW
 
@@ -152,13 +151,13 @@ class _WorkerThread(threads.WorkerThread):
             if self._cancelled:
                 break
             self.progress_signal.emit(progress, image.path, self.STATUS_UNKNOWN)
+            new_path = self._destination / image.path.name
             try:
-                shutil.move(str(image.path), self._destination)
+                utils.files.move_file(image.path, new_path)
             except OSError:
                 self._failed_images.append(image)
                 ok = False
             else:
-                new_path = self._destination / image.path.name
                 ok = image_dao.update_image(image.id, new_path, image.hash)
                 if not ok:
                     self._failed_images.append(image)
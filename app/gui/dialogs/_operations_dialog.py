@@ -278,7 +278,7 @@ class _WorkerThread(threads.WorkerThread):
 
     def _replace_tags(self):
         image_dao = data_access.ImageDao(config.CONFIG.database_path)
-        tags_dao = data_access.TagsDao(config.CONFIG.database_path)
+        tags_dao = data_access.TagsDao(config.CONFIG.database_path, shared_with=image_dao)
         try:
             query = queries.query_to_sympy(self._to_replace, simplify=False)
         except ValueError as e:
@@ -1,23 +1,44 @@
+from __future__ import annotations
+
+import functools
+import operator
+import pathlib
+import typing as typ
+
+import PyQt5.QtCore as QtC
+import PyQt5.QtGui as QtG
 import PyQt5.QtWidgets as QtW
 from PyQt5.QtCore import Qt
 
 from app import data_access, model, utils
 from app.i18n import translate as _t
 from . import _dialog_base
-from .. import components
+from .. import threads
+
+_THUMBNAIL_SIZE = 64  # In pixels
 
 
 class SimilarImagesDialog(_dialog_base.Dialog):
     def __init__(self, images: list[tuple[model.Image, float]], image_dao: data_access.ImageDao,
                  tags_dao: data_access.TagsDao, parent: QtW.QWidget = None):
-        self._images = images
+        # Most likely images first, sorting is stable so images with the same score keep their order
+        self._images = sorted(images, key=operator.itemgetter(1), reverse=True)
         self._index = -1
+        self._resized = False
         super().__init__(parent=parent, title=_t('dialog.similar_images.title'), modal=True, mode=self.OK_CANCEL)
         self._ok_btn.setText(_t('dialog.similar_images.button.copy_tags.label'))
         self._ok_btn.setDisabled(True)
         self._cancel_btn.setText(_t('dialog.similar_images.button.close.label'))
         self._image_dao = image_dao
         self._tags_dao = tags_dao
+        # Sizes and thumbnails are read from the files in the background so that the dialog shows up right away,
+        # thumbnails from previous openings are reused
+        self._info_thread = _ImagesInfoThread(
+            [image.path for image, _ in self._images],
+            {i for i in range(len(self._images)) if not self._model.has_thumbnail(i)}
+        )
+        self._info_thread.progress_signal.connect(self._on_info_read)
+        self._info_thread.start()
 
     def _init_body(self):
         layout = QtW.QVBoxLayout()
@@ -28,82 +49,292 @@ class SimilarImagesDialog(_dialog_base.Dialog):
 
         layout.addSpacing(10)
 
-        grid_layout = QtW.QGridLayout()
-        grid_layout.setContentsMargins(0, 0, 0, 0)
-        grid_layout.setColumnStretch(1, 1)
-        label = QtW.QLabel(_t('dialog.similar_images.grid.header.image_path'), parent=self)
-        label.setAlignment(Qt.AlignCenter)
-        grid_layout.addWidget(label, 0, 1)
-        label = QtW.QLabel(_t('dialog.similar_images.grid.header.image_size'), parent=self)
-        label.setAlignment(Qt.AlignCenter)
-        grid_layout.addWidget(label, 0, 2)
-        label = QtW.QLabel(_t('dialog.similar_images.grid.header.confidence_score'), parent=self)
-        label.setAlignment(Qt.AlignCenter)
-        grid_layout.addWidget(label, 0, 3)
-
-        button_group = QtW.QButtonGroup(parent=self)
-        for i, (image, score) in enumerate(self._images):
-            radio_button = QtW.QRadioButton(parent=self)
-            radio_button.clicked.connect(self._on_radio_button_clicked)
-            radio_button.setWhatsThis(str(i))
-            button_group.addButton(radio_button, id=i)
-            grid_layout.addWidget(radio_button, i + 1, 0)
-
-            label = components.EllipsisLabel(str(image.path), parent=self)
-            # Click on associated radio button when label is clicked
-            label.set_on_click(lambda this: button_group.button(int(this.whatsThis())).click())
-            label.setToolTip(str(image.path))
-            label.setMinimumWidth(80)
-            label.setAlignment(Qt.AlignLeft)
-            label.setWhatsThis(str(i))
-            grid_layout.addWidget(label, i + 1, 1)
-
-            image_size = utils.image.image_size(image.path)
-            label = QtW.QLabel(f'{image_size[0]}×{image_size[1]}', parent=self)
-            label.setFixedWidth(80)
-            label.setAlignment(Qt.AlignCenter)
-            grid_layout.addWidget(label, i + 1, 2)
-
-            label = QtW.QLabel(f'{score * 100:.2f} %', parent=self)
-            label.setFixedWidth(80)
-            label.setAlignment(Qt.AlignCenter)
-            grid_layout.addWidget(label, i + 1, 3)
-
-            button = QtW.QPushButton(
-                utils.gui.icon('folder-open'),
-                _t('dialog.similar_images.grid.open_file_button.label'),
-                parent=self
-            )
-            button.setWhatsThis(str(i))
-            button.clicked.connect(self._on_open_file_button_clicked)
-            button.setFixedWidth(80)
-            grid_layout.addWidget(button, i + 1, 4)
-
-        wrapper_layout = QtW.QVBoxLayout()
-        wrapper_layout.addLayout(grid_layout)
-        wrapper_layout.addStretch()
-
-        scroll = QtW.QScrollArea(parent=self)
-        scroll.setWidgetResizable(True)
-        w = QtW.QWidget(parent=self)
-        w.setLayout(wrapper_layout)
-        scroll.setWidget(w)
-        layout.addWidget(scroll)
-
-        self.setMinimumSize(500, 200)
-        self.setGeometry(0, 0, 500, 200)
+        # Rows are only painted when visible, no widgets are created per image
+        self._table = QtW.QTableView(parent=self)
+        self._model = _SimilarImagesModel(self._images, parent=self._table)
+        self._table.setModel(self._model)
+        self._table.setSelectionBehavior(QtW.QAbstractItemView.SelectRows)
+        self._table.setSelectionMode(QtW.QAbstractItemView.SingleSelection)
+        self._table.setEditTriggers(QtW.QAbstractItemView.NoEditTriggers)
+        self._table.setTextElideMode(Qt.ElideMiddle)
+        self._table.setWordWrap(False)
+        self._table.verticalHeader().hide()
+        self._table.verticalHeader().setDefaultSectionSize(_THUMBNAIL_SIZE + 4)
+        header = self._table.horizontalHeader()
+        for column in range(_SimilarImagesModel.COLUMNS_NUMBER):
+            if column == _SimilarImagesModel.PATH_COLUMN:
+                header.setSectionResizeMode(column, QtW.QHeaderView.Stretch)
+            else:
+                header.setSectionResizeMode(column, QtW.QHeaderView.Fixed)
+                header.resizeSection(column, 80)
+        open_file_delegate = _OpenFileButtonDelegate(parent=self._table)
+        open_file_delegate.clicked.connect(self._on_open_file_button_clicked)
+        self._table.setItemDelegateForColumn(_SimilarImagesModel.OPEN_FILE_COLUMN, open_file_delegate)
+        self._table.selectionModel().selectionChanged.connect(self._on_selection_changed)
+        layout.addWidget(self._table)
+
+        self.setMinimumSize(500, 300)
 
         return layout
 
-    def _on_radio_button_clicked(self):
-        self._index = int(self.sender().whatsThis())
-        self._ok_btn.setDisabled(False)
+    def _on_info_read(self, _, data: tuple[int, tuple[int, int] | None, QtG.QImage | None], __):
+        row, size, thumbnail = data
+        self._model.set_size(row, size)
+        if thumbnail is not None:
+            self._model.set_thumbnail(row, thumbnail)
 
-    def _on_open_file_button_clicked(self):
-        index = int(self.sender().whatsThis())
-        utils.gui.show_file(self._images[index][0].path)
+    def _on_selection_changed(self):
+        selected_rows = self._table.selectionModel().selectedRows()
+        self._index = selected_rows[0].row() if selected_rows else -1
+        self._ok_btn.setDisabled(self._index < 0)
+
+    def _on_open_file_button_clicked(self, index: QtC.QModelIndex):
+        utils.gui.show_file(self._images[index.row()][0].path)
 
     def get_tags(self) -> list[model.Tag] | None:
         if self._applied and 0 <= self._index < len(self._images):
             return self._image_dao.get_image_tags(self._images[self._index][0].id, self._tags_dao)
         return None
+
+    def showEvent(self, event: QtG.QShowEvent):
+        # Geometry is only set once all rows are there, right before the first paint
+        if not self._resized:
+            self._resized = True
+            self.resize(500, 300)
+            utils.gui.center(self)
+        super().showEvent(event)
+
+    def closeEvent(self, event: QtG.QCloseEvent):
+        self._info_thread.cancel()
+        self._info_thread.wait()
+        super().closeEvent(event)
+
+
+class _SimilarImagesModel(QtC.QAbstractTableModel):
+    """Table model listing similar images with their thumbnail, size and confidence score."""
+    THUMBNAIL_COLUMN = 0
+    PATH_COLUMN = 1
+    SIZE_COLUMN = 2
+    SCORE_COLUMN = 3
+    OPEN_FILE_COLUMN = 4
+    COLUMNS_NUMBER = 5
+
+    # Number of rows added to the view each time it needs more
+    _ROWS_BATCH_SIZE = 50
+    # Delay during which received sizes are grouped into a single update of the view
+    _SIZES_UPDATE_DELAY = 50  # In ms
+
+    _HEADERS = {
+        PATH_COLUMN: 'dialog.similar_images.grid.header.image_path',
+        SIZE_COLUMN: 'dialog.similar_images.grid.header.image_size',
+        SCORE_COLUMN: 'dialog.similar_images.grid.header.confidence_score',
+    }
+
+    def __init__(self, images: list[tuple[model.Image, float]], parent: QtC.QObject = None):
+        """Creates a model.
+
+        :param images: The images to list with their confidence score.
+        :param parent: The model’s parent.
+        """
+        super().__init__(parent)
+        # Only the displayed texts are kept, in flat lists indexed by row, as they never change once formatted
+        self._paths = [str(image.path) for image, _ in images]
+        # The modification date invalidates thumbnails of files changed since they were cached
+        self._thumbnail_keys = [_get_thumbnail_key(image.path) for image, _ in images]
+        self._scores = [f'{score * 100:.2f} %' for _, score in images]
+        self._sizes = ['…'] * len(images)  # Placeholders are replaced as sizes are read
+        # Rows are exposed to the view by batches as it is scrolled
+        self._loaded_rows = min(len(images), self._ROWS_BATCH_SIZE)
+        self._pending_rows: set[int] = set()
+        self._sizes_timer = QtC.QTimer(parent=self)
+        self._sizes_timer.setSingleShot(True)
+        self._sizes_timer.setInterval(self._SIZES_UPDATE_DELAY)
+        self._sizes_timer.timeout.connect(self._flush_sizes)
+
+    def has_thumbnail(self, row: int) -> bool:
+        """Tells whether the thumbnail of the image at the given row is in the pixmap cache.
+
+        :param row: Image’s row.
+        """
+        key = self._thumbnail_keys[row]
+        return key is not None and QtG.QPixmapCache.find(key) is not None
+
+    def set_thumbnail(self, row: int, thumbnail: QtG.QImage):
+        """Sets the thumbnail of the image at the given row. It is kept in the pixmap cache for later openings.
+
+        :param row: Image’s row.
+        :param thumbnail: Image’s thumbnail.
+        """
+        if (key := self._thumbnail_keys[row]) is None:
+            return
+        QtG.QPixmapCache.insert(key, QtG.QPixmap.fromImage(thumbnail))
+        if row < self._loaded_rows:
+            index = self.index(row, self.THUMBNAIL_COLUMN)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def set_size(self, row: int, size: tuple[int, int] | None):
+        """Sets the size of the image at the given row. The view is notified once sizes stop coming for a short time.
+
+        :param row: Image’s row.
+        :param size: Image’s size or None if it could not be read.
+        """
+        self._sizes[row] = f'{size[0]}×{size[1]}' if size is not None else ''
+        self._pending_rows.add(row)
+        if not self._sizes_timer.isActive():
+            self._sizes_timer.start()
+
+    def _flush_sizes(self):
+        """Notifies the view of all sizes received since the last call. Rows not yet fetched by the view are ignored."""
+        rows = [row for row in self._pending_rows if row < self._loaded_rows]
+        self._pending_rows.clear()
+        if rows:
+            top_left = self.index(min(rows), self.SIZE_COLUMN)
+            bottom_right = self.index(max(rows), self.SIZE_COLUMN)
+            self.dataChanged.emit(top_left, bottom_right, [Qt.DisplayRole])
+
+    def rowCount(self, parent: QtC.QModelIndex = QtC.QModelIndex()) -> int:
+        return self._loaded_rows if not parent.isValid() else 0
+
+    def canFetchMore(self, parent: QtC.QModelIndex) -> bool:
+        return not parent.isValid() and self._loaded_rows < len(self._paths)
+
+    def fetchMore(self, parent: QtC.QModelIndex):
+        if parent.isValid():
+            return
+        rows_nb = min(len(self._paths) - self._loaded_rows, self._ROWS_BATCH_SIZE)
+        if rows_nb > 0:
+            self.beginInsertRows(QtC.QModelIndex(), self._loaded_rows, self._loaded_rows + rows_nb - 1)
+            self._loaded_rows += rows_nb
+            self.endInsertRows()
+
+    def columnCount(self, parent: QtC.QModelIndex = QtC.QModelIndex()) -> int:
+        return self.COLUMNS_NUMBER if not parent.isValid() else 0
+
+    def data(self, index: QtC.QModelIndex, role: int = Qt.DisplayRole) -> typ.Any:
+        if not index.isValid():
+            return None
+        row = index.row()
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == self.PATH_COLUMN:
+                return self._paths[row]
+            if column == self.SIZE_COLUMN:
+                return self._sizes[row]
+            if column == self.SCORE_COLUMN:
+                return self._scores[row]
+        elif role == Qt.DecorationRole and column == self.THUMBNAIL_COLUMN:
+            key = self._thumbnail_keys[row]
+            return QtG.QPixmapCache.find(key) if key is not None else None
+        elif role == Qt.ToolTipRole and column == self.PATH_COLUMN:
+            return self._paths[row]
+        elif role == Qt.TextAlignmentRole and column != self.PATH_COLUMN:
+            return Qt.AlignCenter
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> typ.Any:
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            key = self._HEADERS.get(section)
+            return _t(key) if key is not None else ''
+        return None
+
+
+class _OpenFileButtonDelegate(QtW.QStyledItemDelegate):
+    """Delegate that paints a button showing the file of its row. No actual widget is created."""
+    clicked = QtC.pyqtSignal(QtC.QModelIndex)
+
+    def __init__(self, parent: QtC.QObject = None):
+        super().__init__(parent)
+        self._icon = utils.gui.icon('folder-open')
+        self._label = _t('dialog.similar_images.grid.open_file_button.label')
+
+    def paint(self, painter: QtG.QPainter, option: QtW.QStyleOptionViewItem, index: QtC.QModelIndex):
+        button_option = QtW.QStyleOptionButton()
+        button_option.rect = option.rect
+        button_option.text = self._label
+        button_option.icon = self._icon
+        button_option.iconSize = QtC.QSize(16, 16)
+        button_option.state = QtW.QStyle.State_Enabled | QtW.QStyle.State_Raised
+        style = option.widget.style() if option.widget is not None else QtW.QApplication.style()
+        style.drawControl(QtW.QStyle.CE_PushButton, button_option, painter, option.widget)
+
+    def editorEvent(self, event: QtC.QEvent, model_: QtC.QAbstractItemModel, option: QtW.QStyleOptionViewItem,
+                    index: QtC.QModelIndex) -> bool:
+        if (event.type() == QtC.QEvent.MouseButtonRelease and event.button() == Qt.LeftButton
+                and option.rect.contains(event.pos())):
+            self.clicked.emit(index)
+            return True
+        return super().editorEvent(event, model_, option, index)
+
+
+class _ImagesInfoThread(threads.WorkerThread):
+    """Reads the size and thumbnail of image files. Results are sent through the progress signal
+    as (index, size, thumbnail) tuples. Thumbnails are QImage objects as QPixmap cannot be created outside
+    the GUI thread.
+    """
+
+    def __init__(self, paths: list[pathlib.Path], thumbnail_indices: set[int]):
+        """Creates a thread.
+
+        :param paths: Paths of the images to read.
+        :param thumbnail_indices: Indices of the images whose thumbnail has to be read.
+        """
+        super().__init__()
+        self._paths = paths
+        self._thumbnail_indices = thumbnail_indices
+
+    def run(self):
+        total = len(self._paths)
+        for i, path in enumerate(self._paths):
+            if self._cancelled:
+                break
+            size = _get_image_size(path)
+            thumbnail = _read_thumbnail(path) if size is not None and i in self._thumbnail_indices else None
+            self.progress_signal.emit((i + 1) / total, (i, size, thumbnail),
+                                      self.STATUS_SUCCESS if size is not None else self.STATUS_FAILED)
+
+
+def _get_thumbnail_key(image_path: pathlib.Path) -> str | None:
+    """Returns the pixmap cache key of the thumbnail of the given image.
+
+    :param image_path: Path to the image.
+    :return: The key or None if the file could not be accessed.
+    """
+    try:
+        mtime = image_path.stat().st_mtime_ns
+    except OSError:
+        return None
+    return f'similar_images_thumbnail:{image_path}:{mtime}'
+
+
+def _read_thumbnail(image_path: pathlib.Path) -> QtG.QImage | None:
+    """Decodes a thumbnail of the given image. The image is scaled down while being decoded,
+    which is much cheaper than decoding it fully.
+
+    :param image_path: Path to the image.
+    :return: The thumbnail or None if the file could not be read.
+    """
+    reader = QtG.QImageReader(str(image_path))
+    size = reader.size()
+    if size.isValid() and (size.width() > _THUMBNAIL_SIZE or size.height() > _THUMBNAIL_SIZE):
+        reader.setScaledSize(size.scaled(_THUMBNAIL_SIZE, _THUMBNAIL_SIZE, Qt.KeepAspectRatio))
+    image = reader.read()
+    return image if not image.isNull() else None
+
+
+def _get_image_size(image_path: pathlib.Path) -> tuple[int, int] | None:
+    """Returns the size of the given image file. Sizes are cached as long as the file is not modified.
+
+    :param image_path: Path to the image.
+    :return: A tuple (width, height) or None if file could not be opened.
+    """
+    try:
+        stat = image_path.stat()
+    except OSError:
+        return None
+    return _get_cached_image_size(image_path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_cached_image_size(image_path: pathlib.Path, _mtime: int, _file_size: int) -> tuple[int, int] | None:
+    """Returns the size of the given image file. Modification date and file size are only part of the cache key."""
+    return utils.image.image_size(image_path)
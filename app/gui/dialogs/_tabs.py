@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import abc
+import collections
 import re
 import typing as typ
 
@@ -24,6 +25,9 @@ class Tab(abc.ABC, typ.Generic[_Type]):
     _EMPTY = 2
     _FORMAT = 4
 
+    # Mask removing the editable and selectable flags of read-only cells
+    _READ_ONLY_FLAGS = ~(QtC.Qt.ItemIsEditable | QtC.Qt.ItemIsSelectable)
+
     def __init__(self, owner: QtW.QWidget, dao: da.TagsDao, title: str, addable: bool, deletable: bool, editable: bool,
                  columns_to_check: list[tuple[int, bool]], search_columns: list[int],
                  selection_changed: typ.Callable[[None], None] = None,
@@ -43,6 +47,7 @@ class Tab(abc.ABC, typ.Generic[_Type]):
         :param rows_deleted: Action called when rows have been deleted. It takes the list of deleted values.
         """
         self._initialized = False
+        self._loaded = False
         self._owner = owner
         self._tags_dao = dao
         self._title = title
@@ -58,7 +63,9 @@ class Tab(abc.ABC, typ.Generic[_Type]):
         # noinspection PyTypeChecker
         self._table: QtW.QTableWidget = None
 
-        self._values = []
+        self._values = []  # (value, count) pairs as loaded from the database
+        # Loaded values mapped to their ID, as rows move when the table is sorted
+        self._original_values: dict[int, _Type] = {}
         self._changed_rows = set()
         self._added_rows = set()
         self._deleted_rows = set()
@@ -67,14 +74,22 @@ class Tab(abc.ABC, typ.Generic[_Type]):
 
         self._valid = True
 
+        # Integrity state of checked columns, updated cell by cell.
+        # Rows are identified by the ID in their first column as row indices change when the table is sorted.
+        self._cell_values: dict[int, dict[int, str]] = {}  # Column -> row ID -> value
+        self._values_counts: dict[int, collections.Counter] = {}  # Column -> value -> occurrences
+        self._duplicate_values: dict[int, set[str]] = {}  # Column -> values used more than once
+        self._invalid_cells: dict[tuple[int, int], tuple[int, str]] = {}  # (row ID, column) -> (status, message)
+
         # Use system colors
-        self._DISABLED_COLOR = QtW.QApplication.palette().color(QtG.QPalette.Disabled, QtG.QPalette.Base)
+        self._DISABLED_BRUSH = QtW.QApplication.palette().brush(QtG.QPalette.Disabled, QtG.QPalette.Base)
 
     @abc.abstractmethod
     def init(self):
-        """Initializes the inner table."""
+        """Initializes the inner table. Rows are only loaded by the load method."""
+        self._initialized = False
+        self._loaded = False
         if self._table:
-            self._initialized = False
             self._table.destroy()
 
         self._table = components.TranslatedTableWidget(parent=self._owner)
@@ -93,6 +108,30 @@ class Tab(abc.ABC, typ.Generic[_Type]):
             delete_action.triggered.connect(self.delete_selected_rows)
             self._table.addAction(delete_action)
 
+    def load(self):
+        """Fills the table from the database if it was not already since the last call to init."""
+        if not self._loaded:
+            self._loaded = True
+            # Filled rows would be moved around if sorting was enabled.
+            # Repaints and signals are suspended until all rows are set.
+            self._table.setSortingEnabled(False)
+            self._table.setUpdatesEnabled(False)
+            self._table.blockSignals(True)
+            try:
+                self._load_rows()
+            finally:
+                self._table.blockSignals(False)
+                self._table.setUpdatesEnabled(True)
+                self._table.setSortingEnabled(True)
+            self._original_values = {value.id: value for value, _ in self._values}
+            self._init_integrity_state()
+            self._initialized = True
+
+    @property
+    def loaded(self) -> bool:
+        """Indicates whether the rows of this tab have been loaded."""
+        return self._loaded
+
     @property
     def table(self) -> QtW.QTableWidget:
         """Returns the inner table."""
@@ -123,12 +162,17 @@ class Tab(abc.ABC, typ.Generic[_Type]):
     def add_row(self):
         """Adds an empty row in the table."""
         row = self._table.rowCount()
+        # Prevent the new row from being moved while its cells are set
+        self._table.setSortingEnabled(False)
         self._table.insertRow(row)
         self._initialized = False
         self._set_row(None, row)
         self._added_rows.add(row)
+        for col in self._columns_to_check:
+            self._update_cell_state(row, col)
         self._initialized = True
         self._dummy_type_id -= 1
+        self._table.setSortingEnabled(True)
 
     def delete_selected_rows(self):
         """Deletes all selected rows."""
@@ -141,6 +185,7 @@ class Tab(abc.ABC, typ.Generic[_Type]):
                 to_delete = []
                 for row in selected_rows:
                     to_delete.append(self.get_value(row))
+                    self._forget_row(row)
                     self._table.setRowHidden(row, True)
                 if self._rows_deleted is not None:
                     self._rows_deleted(to_delete)
@@ -164,6 +209,16 @@ class Tab(abc.ABC, typ.Generic[_Type]):
         if re.search(r'((?<!\\)\\(?:\\\\)*)([^*?\\]|$)', query):
             return None
 
+        if not re.search(r'[*?\\]', query):
+            # No wildcards, let Qt look for the exact text instead of matching every cell against a regex
+            matches = [item for item in self._table.findItems(query, QtC.Qt.MatchFixedString)
+                       if item.column() in self._search_columns and item.row() >= start_row
+                       and not self._table.isRowHidden(item.row())]
+            if not matches:
+                return False
+            self._select_item(min(matches, key=lambda i: (self._search_columns.index(i.column()), i.row())))
+            return True
+
         # Escape regex meta-characters except * and ?
         pattern = re.sub(r'([\[\]()+{.^$])', r'\\\1', query)
         # Replace non-escaped '*' and '?' by a regex
@@ -175,11 +230,11 @@ class Tab(abc.ABC, typ.Generic[_Type]):
         found = False
         for col in self._search_columns:
             for row in range(start_row, row_count):
+                if self._table.isRowHidden(row):
+                    continue
                 item = self._table.item(row, col)
                 if regex.fullmatch(item.text()):
-                    self._table.setFocus()
-                    self._table.scrollToItem(item)
-                    item.setSelected(True)
+                    self._select_item(item)
                     found = True
                     break
             if found:
@@ -187,6 +242,12 @@ class Tab(abc.ABC, typ.Generic[_Type]):
 
         return found
 
+    def _select_item(self, item: QtW.QTableWidgetItem):
+        """Selects the given search result and scrolls to it."""
+        self._table.setFocus()
+        self._table.scrollToItem(item)
+        item.setSelected(True)
+
     @abc.abstractmethod
     def apply(self) -> bool:
         """Applies all changes.
@@ -195,17 +256,31 @@ class Tab(abc.ABC, typ.Generic[_Type]):
         """
         pass
 
+    @staticmethod
+    def _apply_rows(rows: set[int], action: typ.Callable[[int], bool]) -> tuple[set[int], bool]:
+        """Applies an action to each of the given rows.
+
+        :param rows: The rows to apply the action to.
+        :param action: The action. It takes a row and returns whether it succeeded.
+        :return: The rows for which the action failed and whether it succeeded for all rows.
+        """
+        failed_rows = {row for row in rows if not action(row)}
+        return failed_rows, not failed_rows
+
     def check_integrity(self) -> bool:
         """Checks table’s integrity.
 
         :return: True if all cells have valid values.
         """
-        ok = True
-        for col, check_duplicates in self._columns_to_check.items():
-            ok &= self._check_column(col, check_duplicates)[0] == self._OK
-            if not ok:
-                break
-        return ok
+        return not self._invalid_cells and not any(self._duplicate_values.values())
+
+    def get_changed_values(self) -> list[_Type]:
+        """Returns the values of all changed rows."""
+        return [v for row in self._changed_rows if (v := self.get_value(row)) is not None]
+
+    def get_deleted_values(self) -> list[_Type]:
+        """Returns the values of all deleted rows."""
+        return [v for row in self._deleted_rows if (v := self.get_value(row)) is not None]
 
     @abc.abstractmethod
     def get_value(self, row: int) -> _Type | None:
@@ -216,6 +291,11 @@ class Tab(abc.ABC, typ.Generic[_Type]):
         """
         pass
 
+    @abc.abstractmethod
+    def _load_rows(self):
+        """Fetches the values from the database and fills the table with them."""
+        pass
+
     @abc.abstractmethod
     def _set_row(self, value: _Type | None, row: int):
         """Sets the value at the given row.
@@ -234,37 +314,101 @@ class Tab(abc.ABC, typ.Generic[_Type]):
         """
         pass
 
-    def _check_column(self, column: int, check_duplicates: bool) -> tuple[int, int, str]:
-        """Checks column’s integrity.
-
-        :param column: The column to check.
-        :param check_duplicates: Whether to check for any duplicate cell values.
-        :return: A tuple with 3 values: table integrity which is one of OK, DUPLICATE, EMPTY or FORMAT; row of the
-                 invalid cell or -1 if whole column is valid; the error message.
-                 OK if all cells have valid values;
-                 DUPLICATE if some cells have identical values;
-                 EMPTY if a cell is empty;
-                 FORMAT if a cell is not formatted correctly.
+    def _init_integrity_state(self):
+        """Builds the integrity state of all checked columns from the visible rows.
+        Formats are not checked as rows hold values loaded from the database.
         """
+        self._cell_values = {col: {} for col in self._columns_to_check}
+        self._values_counts = {col: collections.Counter() for col in self._columns_to_check}
+        self._duplicate_values = {col: set() for col in self._columns_to_check}
+        self._invalid_cells = {}
         for row in range(self._table.rowCount()):
-            if self._table.isRowHidden(row):
-                continue
+            if not self._table.isRowHidden(row):
+                for col in self._columns_to_check:
+                    self._update_cell_state(row, col, check_format=False)
 
-            if self._table.item(row, column).text().strip() == '':
-                return self._EMPTY, row, _t('dialog.edit_tags.error.empty_cell')
+    def _row_id(self, row: int) -> int:
+        """Returns the ID displayed in the first column of the given row."""
+        return int(self._table.item(row, 0).text())
 
-            ok, message = self._check_cell_format(row, column)
+    def _update_cell_state(self, row: int, col: int, check_format: bool = True):
+        """Updates the integrity state of the given cell after its value changed.
+
+        :param row: Cell’s row.
+        :param col: Cell’s column. Must be one of the checked columns.
+        :param check_format: Whether to check the format of the cell’s value.
+        """
+        ident = self._row_id(row)
+        value = self._table.item(row, col).text()
+        if self._cell_values[col].get(ident) == value:
+            # cellChanged is also emitted for changes that leave the text untouched, the state is already up to date
+            return
+        self._remove_cell_value(ident, col)
+        self._cell_values[col][ident] = value
+        counts = self._values_counts[col]
+        counts[value] += 1
+        if self._columns_to_check[col] and counts[value] == 2:
+            self._duplicate_values[col].add(value)
+
+        if value.strip() == '':
+            self._invalid_cells[(ident, col)] = (self._EMPTY, _t('dialog.edit_tags.error.empty_cell'))
+            return
+        if check_format:
+            ok, message = self._check_cell_format(row, col)
             if not ok:
-                return self._FORMAT, row, message
+                self._invalid_cells[(ident, col)] = (self._FORMAT, message)
+                return
+        self._invalid_cells.pop((ident, col), None)
+
+    def _remove_cell_value(self, ident: int, col: int):
+        """Removes the value of the given cell from the integrity state.
+
+        :param ident: ID of the cell’s row.
+        :param col: Cell’s column.
+        """
+        value = self._cell_values[col].pop(ident, None)
+        if value is not None:
+            counts = self._values_counts[col]
+            counts[value] -= 1
+            if counts[value] < 2:
+                self._duplicate_values[col].discard(value)
+            if counts[value] == 0:
+                del counts[value]
+
+    def _forget_row(self, row: int):
+        """Removes all cells of the given row from the integrity state.
+
+        :param row: The row.
+        """
+        ident = self._row_id(row)
+        for col in self._columns_to_check:
+            self._remove_cell_value(ident, col)
+            self._invalid_cells.pop((ident, col), None)
 
-            if check_duplicates:
-                cell_value = self._table.item(row, column).text()
-                for r in range(self._table.rowCount()):
-                    if self._table.isRowHidden(r):
-                        continue
-                    if r != row and self._table.item(r, column).text() == cell_value:
-                        return self._DUPLICATE, r, _t('dialog.edit_tags.error.duplicate_value', row=row)
-        return self._OK, -1, ''
+    def _check_cell(self, row: int, col: int) -> tuple[int, str]:
+        """Updates then returns the integrity state of the given cell.
+
+        :param row: Cell’s row.
+        :param col: Cell’s column.
+        :return: A tuple with 2 values: cell integrity which is one of OK, DUPLICATE, EMPTY or FORMAT; the error
+                 message.
+                 OK if the cell’s value is valid;
+                 DUPLICATE if another visible cell of the column has the same value;
+                 EMPTY if the cell is empty;
+                 FORMAT if the cell is not formatted correctly.
+        """
+        if col not in self._columns_to_check:
+            return self._OK, ''
+        self._update_cell_state(row, col)
+        if (state := self._invalid_cells.get((self._row_id(row), col))) is not None:
+            return state
+        value = self._table.item(row, col).text()
+        if value in self._duplicate_values[col]:
+            for item in self._table.findItems(value, QtC.Qt.MatchExactly):
+                other_row = item.row()
+                if item.column() == col and other_row != row and not self._table.isRowHidden(other_row):
+                    return self._DUPLICATE, _t('dialog.edit_tags.error.duplicate_value', row=other_row)
+        return self._OK, ''
 
     @abc.abstractmethod
     def _check_cell_format(self, row: int, col: int) -> (bool, str):
@@ -321,7 +465,9 @@ class TagTypesTab(Tab[model.TagType]):
             _t('dialog.edit_tags.tab.tag_types.table.header.color'),
             _t('dialog.edit_tags.tab.tags_common.table.header.usage'),
         ])
+        self._table.cellClicked.connect(self._on_cell_clicked)
 
+    def _load_rows(self):
         self._values = self._tags_dao.get_all_tag_types(get_count=True)
         self._table.setRowCount(len(self._values))
 
@@ -333,75 +479,41 @@ class TagTypesTab(Tab[model.TagType]):
             utils.gui.show_error(_t('popup.tag_types_load_error.text'), parent=self._owner)
             self._values = []
 
-        self._initialized = True
-
     def apply(self) -> bool:
-        ok = True
-
-        to_keep = []
-        for row in self._added_rows:
-            res = self._tags_dao.add_type(self.get_value(row))
-            if not res:
-                to_keep.append(row)
-            ok &= res
-        self._added_rows = set(to_keep)
-
-        to_keep = []
-        for row in self._deleted_rows:
-            res = self._tags_dao.delete_type(self.get_value(row).id)
-            if not res:
-                to_keep.append(row)
-            ok &= res
-        self._deleted_rows = set(to_keep)
-
-        to_keep = []
-        for row in self._changed_rows:
-            res = self._tags_dao.update_type(self.get_value(row))
-            if not res:
-                to_keep.append(row)
-            ok &= res
-        self._changed_rows = set(to_keep)
-
-        return ok
+        self._added_rows, added = self._apply_rows(
+            self._added_rows, lambda row: self._tags_dao.add_type(self.get_value(row)))
+        self._deleted_rows, deleted = self._apply_rows(
+            self._deleted_rows, lambda row: self._tags_dao.delete_type(self.get_value(row).id))
+        self._changed_rows, changed = self._apply_rows(
+            self._changed_rows, lambda row: self._tags_dao.update_type(self.get_value(row)))
+        return added and deleted and changed
 
     def get_value(self, row: int) -> model.TagType | None:
-        args = {}
-
-        for i in range(self._table.columnCount()):
-            cell = self._table.item(row, i)
-            if cell is None:
-                cell = self._table.cellWidget(row, i)
-            arg = cell.whatsThis()
-            if arg == '':
-                continue
-            if arg == 'color':
-                args[arg] = cell.palette().button().color()
-            else:
-                args[arg] = cell.text() if arg != 'ident' else int(cell.text())
-
         try:
-            return model.TagType(**args)
+            return model.TagType(
+                ident=int(self._table.item(row, 0).text()),
+                label=self._table.item(row, 1).text(),
+                symbol=self._table.item(row, 2).text(),
+                # Color cells display the name of their color
+                color=QtG.QColor(self._table.item(row, 3).text())
+            )
         except ValueError:
             return None
 
     def _cell_edited(self, row: int, col: int):
         if self._initialized and self._editable:
-            if col != 3:
-                status, invalid_row, message = self._check_column(col, self._columns_to_check.get(col, True))
-                if status != self._OK:
-                    utils.gui.show_error(message, parent=self._owner)
+            status, message = self._check_cell(row, col)
+            if status != self._OK:
+                utils.gui.show_error(message, parent=self._owner)
 
             if row not in self._added_rows:
-                if self.get_value(row) != self._values[row]:
+                if self.get_value(row) != self._original_values.get(self._row_id(row)):
                     self._changed_rows.add(row)
                 elif row in self._changed_rows:
                     self._changed_rows.remove(row)
 
             if self._cell_changed is not None:
-                cell = self._table.item(row, col)
-                if cell is None:
-                    cell = self._table.cellWidget(row, col)
-                self._cell_changed(row, col, cell.text())
+                self._cell_changed(row, col, self._table.item(row, col).text())
 
     def _check_cell_format(self, row: int, col: int) -> (bool, str):
         text = self._table.item(row, col).text()
@@ -416,65 +528,62 @@ class TagTypesTab(Tab[model.TagType]):
     def _set_row(self, tag_type: model.TagType | None, row: int):
         defined = tag_type is not None
         id_item = _IntTableWidgetItem(str(tag_type.id) if defined else str(self._dummy_type_id))
-        id_item.setWhatsThis('ident')
         # noinspection PyTypeChecker
-        id_item.setFlags(id_item.flags() & ~QtC.Qt.ItemIsEditable & ~QtC.Qt.ItemIsSelectable)
+        id_item.setFlags(id_item.flags() & self._READ_ONLY_FLAGS)
         if self._editable:
-            id_item.setBackground(self._DISABLED_COLOR)
+            id_item.setBackground(self._DISABLED_BRUSH)
         self._table.setItem(row, 0, id_item)
 
         label_item = QtW.QTableWidgetItem(tag_type.label if defined
                                           else _t('dialog.edit_tags.tab.tag_types.table.default_label'))
-        label_item.setWhatsThis('label')
         if not self._editable:
             # noinspection PyTypeChecker
-            label_item.setFlags(label_item.flags() & ~QtC.Qt.ItemIsEditable & ~QtC.Qt.ItemIsSelectable)
+            label_item.setFlags(label_item.flags() & self._READ_ONLY_FLAGS)
         self._table.setItem(row, 1, label_item)
 
         symbol_item = QtW.QTableWidgetItem(tag_type.symbol if defined else '§')
-        symbol_item.setWhatsThis('symbol')
         if not self._editable:
             # noinspection PyTypeChecker
-            symbol_item.setFlags(symbol_item.flags() & ~QtC.Qt.ItemIsEditable & ~QtC.Qt.ItemIsSelectable)
+            symbol_item.setFlags(symbol_item.flags() & self._READ_ONLY_FLAGS)
         self._table.setItem(row, 2, symbol_item)
 
-        default_color = QtG.QColor(0, 0, 0)
-        bg_color = tag_type.color if defined else default_color
-        color_btn = QtW.QPushButton(tag_type.color.name() if defined else default_color.name(), parent=self._owner)
-        color_btn.setWhatsThis('color')
-        self._set_button_bg_color(color_btn, bg_color)
-        color_btn.setFocusPolicy(QtC.Qt.NoFocus)
-        color_btn.clicked.connect(self._show_color_picker)
-        color_btn.setProperty('row', row)
-        if not self._editable:
-            color_btn.setEnabled(False)
-        self._table.setCellWidget(row, 3, color_btn)
+        # The color is painted by the cell itself, clicking it opens a color picker
+        color_item = QtW.QTableWidgetItem()
+        # Not selectable so that the color stays visible when the row is selected
+        # noinspection PyTypeChecker
+        color_item.setFlags(color_item.flags() & self._READ_ONLY_FLAGS)
+        self._set_color_cell(color_item, tag_type.color if defined else QtG.QColor(0, 0, 0))
+        self._table.setItem(row, 3, color_item)
 
         # count property is added to tag argument before calling this method.
         # noinspection PyUnresolvedReferences
         number_item = _IntTableWidgetItem(str(tag_type.count if defined else 0))
         # noinspection PyTypeChecker
-        number_item.setFlags(number_item.flags() & ~QtC.Qt.ItemIsEditable & ~QtC.Qt.ItemIsSelectable)
+        number_item.setFlags(number_item.flags() & self._READ_ONLY_FLAGS)
         if self._editable:
-            number_item.setBackground(self._DISABLED_COLOR)
+            number_item.setBackground(self._DISABLED_BRUSH)
         self._table.setItem(row, 4, number_item)
 
-    def _show_color_picker(self):
-        """Shows a color picker then sets the event button to the selected color."""
-        # noinspection PyTypeChecker
-        button: QtW.QPushButton = self._owner.sender()
-        # Set initial color to the button’s current background color
-        color = QtW.QColorDialog.getColor(button.palette().button().color(), parent=self._owner)
-        if color.isValid():
-            row = button.property('row')
-            button.setText(color.name())
-            self._set_button_bg_color(button, color)
-            self._cell_edited(row, 3)
+    def _on_cell_clicked(self, row: int, col: int):
+        """Shows a color picker when a color cell is clicked then sets the cell to the selected color."""
+        if col == 3 and self._editable:
+            item = self._table.item(row, col)
+            # Set initial color to the cell’s current color
+            color = QtW.QColorDialog.getColor(QtG.QColor(item.text()), parent=self._owner)
+            if color.isValid():
+                self._set_color_cell(item, color)
 
-    @staticmethod
-    def _set_button_bg_color(button: QtW.QPushButton, color: QtG.QColor):
-        button.setStyleSheet(
-            f'background-color: {color.name()}; color: {utils.gui.font_color(color).name()}; border: none')
+    def _set_color_cell(self, item: QtW.QTableWidgetItem, color: QtG.QColor):
+        """Sets the color displayed by the given cell. Only the change of its text is notified.
+
+        :param item: The color cell.
+        :param color: The color.
+        """
+        blocked = self._table.blockSignals(True)
+        item.setBackground(QtG.QBrush(color))
+        item.setForeground(QtG.QBrush(utils.gui.font_color(color)))
+        self._table.blockSignals(blocked)
+        item.setText(color.name())
 
 
 _TagType = typ.TypeVar('_TagType', model.Tag, model.CompoundTag)
@@ -482,7 +591,8 @@ _TagType = typ.TypeVar('_TagType', model.Tag, model.CompoundTag)
 
 class _TagsTab(Tab[_TagType], typ.Generic[_TagType], metaclass=abc.ABCMeta):
     """This class represents a tab containing a table that displays all defined tags."""
-    COMBO_ITEM_PATTERN = re.compile(r'^(\d+) - (.+)$')
+    # Names of the tag class’ constructor arguments for each additional column
+    _ADDITIONAL_ARGS: tuple[str, ...] = ()
 
     def __init__(self, owner: QtW.QWidget, dao: da.TagsDao, title: str, addable: bool, editable: bool,
                  tag_class: typ.Type[_TagType], additional_columns: list[tuple[str, bool]],
@@ -521,6 +631,15 @@ class _TagsTab(Tab[_TagType], typ.Generic[_TagType], metaclass=abc.ABCMeta):
         ]
         self._type_column = 2 + len(additional_columns)
         self._tag_use_count_column = 1 + self._type_column
+        self._tag_types: dict[int, model.TagType] = {}
+        # Model shared by all type comboboxes, its first item stands for no type
+        self._types_model = QtG.QStandardItemModel()
+        self._type_rows: dict[int, int] = {}  # Type ID -> row in types model
+        self._no_type_label = ''
+        self._type_font = QtG.QFont()
+        self._no_type_font = QtG.QFont()
+        # Results of tag_exists by (tag ID, label), valid until changes are applied to the database
+        self._tag_exists_cache: dict[tuple[int, str], bool] = {}
 
     def init(self):
         super().init()
@@ -528,6 +647,29 @@ class _TagsTab(Tab[_TagType], typ.Generic[_TagType], metaclass=abc.ABCMeta):
         self._table.setColumnCount(len(self._columns))
         self._table.setColumnWidth(0, 30)
         self._table.setHorizontalHeaderLabels(self._columns)
+        if self._editable:
+            self._table.setItemDelegateForColumn(self._type_column, _TagTypeDelegate(self, parent=self._table))
+        self._tag_types = {}
+        self._types_model.clear()
+        self._type_rows = {}
+        self._tag_exists_cache = {}
+        # Shared by the type cells of all rows
+        self._no_type_label = _t('dialog.edit_tags.tab.tags_common.table.combo_no_type')
+        self._type_font = QtG.QFont(self._table.font())
+        self._no_type_font = QtG.QFont(self._type_font)
+        self._no_type_font.setItalic(True)
+
+    def _load_rows(self):
+        # Types are fetched once, type cells only hold the type’s ID
+        self._tag_types = {tag_type.id: tag_type for tag_type in self._tags_dao.get_all_tag_types() or []}
+        no_type_item = QtG.QStandardItem(self._no_type_label)
+        no_type_item.setData(None, QtC.Qt.UserRole)
+        self._types_model.appendRow(no_type_item)
+        for tag_type in self._tag_types.values():
+            item = QtG.QStandardItem(tag_type.label)
+            item.setData(tag_type.id, QtC.Qt.UserRole)
+            self._types_model.appendRow(item)
+        self._update_type_rows()
 
         self._values = self._tags_dao.get_all_tags(self._tag_class, sort_by_label=True,
                                                    get_count=self._tag_class == model.Tag)
@@ -544,174 +686,170 @@ class _TagsTab(Tab[_TagType], typ.Generic[_TagType], metaclass=abc.ABCMeta):
             utils.gui.show_error(_t('popup.tags_load_error.text'), parent=self._owner)
             self._values = []
 
-        self._initialized = True
-
     def apply(self) -> bool:
-        ok = True
-
-        to_keep = []
-        for row in self._added_rows:
-            res = self._tags_dao.add_compound_tag(self.get_value(row))
-            if not res:
-                to_keep.append(row)
-            ok &= res
-        self._added_rows = set(to_keep)
-
-        to_keep = []
-        for row in self._deleted_rows:
-            res = self._tags_dao.delete_tag(self.get_value(row).id)
-            if not res:
-                to_keep.append(row)
-            ok &= res
-        self._deleted_rows = set(to_keep)
-
-        to_keep = []
-        for row in self._changed_rows:
-            res = self._tags_dao.update_tag(self.get_value(row))
-            if not res:
-                to_keep.append(row)
-            ok &= res
-        self._changed_rows = set(to_keep)
-
-        return ok
+        self._added_rows, added = self._apply_rows(
+            self._added_rows, lambda row: self._tags_dao.add_compound_tag(self.get_value(row)))
+        self._deleted_rows, deleted = self._apply_rows(
+            self._deleted_rows, lambda row: self._tags_dao.delete_tag(self.get_value(row).id))
+        self._changed_rows, changed = self._apply_rows(
+            self._changed_rows, lambda row: self._tags_dao.update_tag(self.get_value(row)))
+        return added and deleted and changed
 
     def get_value(self, row: int) -> _TagType | None:
-        args = {}
-
-        for i in range(self._table.columnCount()):
-            cell = self._table.item(row, i)
-            if cell is None:
-                cell = self._table.cellWidget(row, i)
-            if cell is None:
-                continue
-            arg = cell.whatsThis()
-            if arg == '':
-                continue
-            if arg == 'tag_type':
-                if cell.currentIndex() != 0:
-                    ident = self._id_from_combo(cell.currentText())
-                    if ident is not None:
-                        args[arg] = self._tags_dao.get_tag_type_from_id(ident)
-            else:
-                args[arg] = cell.text() if arg != 'ident' else int(cell.text())
+        type_id = self._table.item(row, self._type_column).data(QtC.Qt.UserRole)
+        args = {
+            'ident': int(self._table.item(row, 0).text()),
+            'label': self._table.item(row, 1).text(),
+            'tag_type': self._tag_types.get(type_id) if type_id is not None else None,
+        }
+        for j, arg in enumerate(self._ADDITIONAL_ARGS):
+            args[arg] = self._table.item(row, 2 + j).text()
 
         try:
             return self._tag_class(**args)
         except ValueError:
             return None
 
+    @property
+    def types_model(self) -> QtG.QStandardItemModel:
+        """Returns the model listing all selectable tag types. Type IDs are stored in the UserRole of each item."""
+        return self._types_model
+
+    def get_type_row(self, type_id: int | None) -> int:
+        """Returns the row of the given type in the types model.
+
+        :param type_id: Type’s ID.
+        :return: The type’s row or 0, the row for no type, if the type is None or not selectable.
+        """
+        return self._type_rows.get(type_id, 0)
+
     def update_type_label(self, tag_type: model.TagType):
-        """Updates the name of the given type in all comboboxes.
+        """Updates the name of the given type in all type cells.
 
         :param tag_type: The type to update.
         """
+        if tag_type.id not in self._type_rows:
+            return
+        self._types_model.item(self._type_rows[tag_type.id]).setText(tag_type.label)
+        self._initialized = False
         for tag_row in range(self._table.rowCount()):
             if not self._table.isRowHidden(tag_row):
-                combo = self._table.cellWidget(tag_row, self._type_column)
-                for i in range(combo.count()):
-                    if combo.itemText(i).startswith(f'{tag_type.id} '):
-                        combo.setItemText(i, self._get_combo_text(tag_type.id, tag_type.label))
-                        break
+                item = self._table.item(tag_row, self._type_column)
+                if item.data(QtC.Qt.UserRole) == tag_type.id:
+                    item.setText(tag_type.label)
+        self._initialized = True
 
     def delete_types(self, deleted_types: list[model.TagType]):
-        """Removes from all comboboxes the tag types that have been deleted.
+        """Removes the tag types that have been deleted from all type cells.
 
         :param deleted_types: All deleted tag types.
         """
-        for tag_type in deleted_types:
-            ident, label = tag_type.id, tag_type.label
-            for tag_row in range(self._table.rowCount()):
-                combo = self._table.cellWidget(tag_row, self._type_column)
-                current_type = self._label_from_combo(combo.currentText())
-                combo.removeItem(combo.findText(self._get_combo_text(ident, label)))
-                if current_type == label:
-                    combo.setCurrentIndex(0)
+        deleted_ids = {tag_type.id for tag_type in deleted_types}
+        # Remove from the bottom so that the rows of remaining types stay valid
+        for model_row in sorted((self._type_rows[ident] for ident in deleted_ids if ident in self._type_rows),
+                                reverse=True):
+            self._types_model.removeRow(model_row)
+        self._update_type_rows()
+        for tag_row in range(self._table.rowCount()):
+            if self._table.item(tag_row, self._type_column).data(QtC.Qt.UserRole) in deleted_ids:
+                self.set_type_cell(tag_row, None)
+
+    def set_type_cell(self, row: int, type_id: int | None):
+        """Sets the type of the tag at the given row.
+
+        :param row: The row.
+        :param type_id: ID of the new type, None to remove the tag’s type.
+        """
+        index = self._table.model().index(row, self._type_column)
+        # Set all roles at once to emit a single cellChanged signal
+        self._table.model().setItemData(index, self._get_type_cell_data(type_id))
+
+    def _update_type_rows(self):
+        """Maps the ID of each type to its row in the types model."""
+        self._type_rows = {self._types_model.item(row).data(QtC.Qt.UserRole): row
+                           for row in range(1, self._types_model.rowCount())}
+
+    def _get_type_cell_data(self, type_id: int | None) -> dict[int, typ.Any]:
+        """Returns the data of a type cell for the given type.
+
+        :param type_id: Type’s ID or None if the tag has no type.
+        :return: The data for each role of the cell.
+        """
+        if type_id is None:
+            return {
+                QtC.Qt.DisplayRole: self._no_type_label,
+                QtC.Qt.UserRole: None,
+                QtC.Qt.FontRole: self._no_type_font,
+            }
+        return {
+            QtC.Qt.DisplayRole: self._types_model.item(self.get_type_row(type_id)).text(),
+            QtC.Qt.UserRole: type_id,
+            QtC.Qt.FontRole: self._type_font,
+        }
 
     def _set_row(self, tag: _TagType | None, row: int):
         defined = tag is not None
         id_item = _IntTableWidgetItem(str(tag.id if defined else self._dummy_type_id))
-        id_item.setWhatsThis('ident')
         # noinspection PyTypeChecker
-        id_item.setFlags(id_item.flags() & ~QtC.Qt.ItemIsEditable & ~QtC.Qt.ItemIsSelectable)
+        id_item.setFlags(id_item.flags() & self._READ_ONLY_FLAGS)
         if self._editable:
-            id_item.setBackground(self._DISABLED_COLOR)
+            id_item.setBackground(self._DISABLED_BRUSH)
         self._table.setItem(row, 0, id_item)
 
         label_item = QtW.QTableWidgetItem(tag.label if defined else 'new_tag')
-        label_item.setWhatsThis('label')
         self._table.setItem(row, 1, label_item)
 
         # Populate additional columns
         for j, column in enumerate(self._columns[2:-2]):
-            value, cell_label = self._get_value_for_column(column, tag, not defined)
-            item = QtW.QTableWidgetItem(value)
-            item.setWhatsThis(cell_label)
+            item = QtW.QTableWidgetItem(self._get_value_for_column(column, tag, not defined))
             if not self._editable:
                 # noinspection PyTypeChecker
-                item.setFlags(item.flags() & ~QtC.Qt.ItemIsEditable & ~QtC.Qt.ItemIsSelectable)
+                item.setFlags(item.flags() & self._READ_ONLY_FLAGS)
             self._table.setItem(row, 2 + j, item)
 
+        # Type cells are plain items, a combobox is only created by the delegate while a cell is being edited
+        type_item = QtW.QTableWidgetItem()
+        type_id = tag.type.id if defined and tag.type is not None else None
+        for role, value in self._get_type_cell_data(type_id).items():
+            type_item.setData(role, value)
         if not self._editable:
             # noinspection PyTypeChecker
-            label_item.setFlags(label_item.flags() & ~QtC.Qt.ItemIsEditable & ~QtC.Qt.ItemIsSelectable)
-
-            if defined and tag.type:
-                text = tag.type.label
-            else:
-                text = _t('dialog.edit_tags.tab.tags_common.table.combo_no_type')
-            type_item = QtW.QTableWidgetItem(text)
-            font = type_item.font()
-            font.setItalic(not defined or not tag.type)
-            type_item.setFont(font)
+            label_item.setFlags(label_item.flags() & self._READ_ONLY_FLAGS)
             # noinspection PyTypeChecker
-            type_item.setFlags(type_item.flags() & ~QtC.Qt.ItemIsEditable & ~QtC.Qt.ItemIsSelectable)
-            self._table.setItem(row, self._type_column, type_item)
-        else:
-            combo = QtW.QComboBox(parent=self._owner)
-            combo.currentIndexChanged.connect(self._combo_changed)
-            combo.setWhatsThis('tag_type')
-            combo.setProperty('row', row)
-            combo.addItem(_t('dialog.edit_tags.tab.tags_common.table.combo_no_type'))
-            for tag_type in self._tags_dao.get_all_tag_types():
-                combo.addItem(self._get_combo_text(tag_type.id, tag_type.label))
-            if defined and tag.type is not None:
-                combo.setCurrentIndex(combo.findText(self._get_combo_text(tag.type.id, tag.type.label)))
-            self._table.setCellWidget(row, self._type_column, combo)
+            type_item.setFlags(type_item.flags() & self._READ_ONLY_FLAGS)
+        self._table.setItem(row, self._type_column, type_item)
 
         # count property is added to tag argument before calling this method.
         number_item = _IntTableWidgetItem(str(getattr(tag, 'count') if defined else 0))
         # noinspection PyTypeChecker
-        number_item.setFlags(number_item.flags() & ~QtC.Qt.ItemIsEditable & ~QtC.Qt.ItemIsSelectable)
+        number_item.setFlags(number_item.flags() & self._READ_ONLY_FLAGS)
         if self._editable:
-            number_item.setBackground(self._DISABLED_COLOR)
+            number_item.setBackground(self._DISABLED_BRUSH)
         self._table.setItem(row, self._tag_use_count_column, number_item)
 
-    def _get_value_for_column(self, column_name: str, value: _TagType, default: bool) -> tuple[str, str]:
+    def _get_value_for_column(self, column_name: str, value: _TagType, default: bool) -> str:
         """Returns the value for the given column and tag.
 
         :param column_name: Column’s name.
         :param value: The tag.
-        :return: A tuple with the value and the cell label.
+        :return: The value.
         """
         pass
 
     def _cell_edited(self, row: int, col: int):
         if self._initialized and self._editable:
-            if col != self._type_column:
-                status, invalid_row, message = self._check_column(col, self._columns_to_check.get(col, True))
-                if status != self._OK:
-                    utils.gui.show_error(message, parent=self._owner)
+            status, message = self._check_cell(row, col)
+            if status != self._OK:
+                utils.gui.show_error(message, parent=self._owner)
 
             if row not in self._added_rows:
-                if self.get_value(row) != self._values[row][0]:
+                if self.get_value(row) != self._original_values.get(self._row_id(row)):
                     self._changed_rows.add(row)
                 elif row in self._changed_rows:
                     self._changed_rows.remove(row)
 
             if self._cell_changed is not None:
-                text = self._table.item(row, col).text() if col != self._type_column else \
-                    self._table.cellWidget(row, col).currentText()
-                self._cell_changed(row, col, text)
+                self._cell_changed(row, col, self._table.item(row, col).text())
 
     def _check_cell_format(self, row: int, col: int) -> (bool, str):
         text = self._table.item(row, col).text()
@@ -719,48 +857,14 @@ class _TagsTab(Tab[_TagType], typ.Generic[_TagType], metaclass=abc.ABCMeta):
             if model.Tag.LABEL_PATTERN.match(text) is None:
                 return False, _t('dialog.edit_tags.error.invalid_tag_name')
             tag_id = int(self._table.item(row, 0).text())
-            if self._tags_dao.tag_exists(tag_id, text):
+            if (exists := self._tag_exists_cache.get((tag_id, text))) is None:
+                exists = self._tags_dao.tag_exists(tag_id, text)
+                if exists is not None:  # Do not keep errors
+                    self._tag_exists_cache[(tag_id, text)] = exists
+            if exists:
                 return False, _t('dialog.edit_tags.error.duplicate_tag_name')
         return True, ''
 
-    def _combo_changed(self, _):
-        """Called when a combobox changes."""
-        if self._initialized:
-            combo = self._owner.sender()
-            self._cell_edited(combo.property('row'), self._type_column)
-
-    def _label_from_combo(self, text: str) -> str | None:
-        """Returns the label of the tag type represented by the given text from a combobox.
-
-        :param text: The text to get the label from.
-        :return: The type's label or None.
-        """
-        match = self.COMBO_ITEM_PATTERN.search(text)
-        if match is not None:
-            return match.group(2)
-        return None
-
-    def _id_from_combo(self, text: str) -> int | None:
-        """Returns the ID of the tag type represented by the given text from a combobox.
-
-        :param text: The text to get the ID from.
-        :return: The ID or None.
-        """
-        match = self.COMBO_ITEM_PATTERN.search(text)
-        if match is not None:
-            return int(match.group(1))
-        return None
-
-    @staticmethod
-    def _get_combo_text(ident: int, label: str) -> str:
-        """Formats an ID and label to a combobox item label.
-
-        :param ident: Type’s ID.
-        :param label: Type’s label.
-        :return: The formatted string.
-        """
-        return f'{ident} - {label}'
-
 
 class TagsTab(_TagsTab[model.Tag]):
     def __init__(self, owner: QtW.QWidget, dao: da.TagsDao, editable: bool,
@@ -792,6 +896,8 @@ class TagsTab(_TagsTab[model.Tag]):
 
 
 class CompoundTagsTab(_TagsTab[model.CompoundTag]):
+    _ADDITIONAL_ARGS = ('definition',)
+
     def __init__(self, owner: QtW.QWidget, dao: da.TagsDao, editable: bool,
                  selection_changed: typ.Callable[[None], None] = None,
                  cell_changed: typ.Callable[[int, int, str], None] = None,
@@ -820,27 +926,65 @@ class CompoundTagsTab(_TagsTab[model.CompoundTag]):
             cell_changed=cell_changed,
             rows_deleted=rows_deleted
         )
+        # Syntax error messages of already parsed definitions, empty for valid ones
+        self._definition_errors: dict[str, str] = {}
 
     def init(self):
         super().init()
         self._table.setColumnHidden(self._tag_use_count_column, True)
 
-    def _get_value_for_column(self, column_name: str, tag: model.CompoundTag, default: bool) -> tuple[str, str]:
-        return (tag.definition if not default else ''), 'definition'
+    def _get_value_for_column(self, column_name: str, tag: model.CompoundTag, default: bool) -> str:
+        return tag.definition if not default else ''
 
     def _check_cell_format(self, row: int, col: int) -> (bool, str):
         ok, message = super()._check_cell_format(row, col)
         if not ok:
             return False, message
         if col == 2:
-            tag_label = self._table.item(row, 2).text()
-            try:
-                queries.query_to_sympy(tag_label, simplify=False)
-            except ValueError as e:
-                return False, str(e)
+            definition = self._table.item(row, 2).text()
+            # Parsing is costly and only depends on the text
+            if (error := self._definition_errors.get(definition)) is None:
+                try:
+                    queries.query_to_sympy(definition, simplify=False)
+                except ValueError as e:
+                    error = str(e)
+                else:
+                    error = ''
+                self._definition_errors[definition] = error
+            if error:
+                return False, error
         return True, ''
 
 
 class _IntTableWidgetItem(QtW.QTableWidgetItem):
     def __lt__(self, other: _IntTableWidgetItem):
         return int(self.text()) < int(other.text())
+
+
+class _TagTypeDelegate(QtW.QStyledItemDelegate):
+    """Delegate that edits the type cells of a tags tab through a combobox."""
+
+    def __init__(self, tab: _TagsTab, parent: QtC.QObject = None):
+        """Creates a delegate.
+
+        :param tab: The tab whose type cells are edited.
+        :param parent: The delegate’s parent.
+        """
+        super().__init__(parent)
+        self._tab = tab
+
+    def createEditor(self, parent: QtW.QWidget, option: QtW.QStyleOptionViewItem, index: QtC.QModelIndex) \
+            -> QtW.QWidget:
+        combo = QtW.QComboBox(parent=parent)
+        combo.setModel(self._tab.types_model)
+        # Commit as soon as a type is picked
+        combo.activated.connect(lambda _: self.commitData.emit(combo))
+        return combo
+
+    def setEditorData(self, editor: QtW.QComboBox, index: QtC.QModelIndex):
+        editor.setCurrentIndex(self._tab.get_type_row(index.data(QtC.Qt.UserRole)))
+
+    def setModelData(self, editor: QtW.QComboBox, model_: QtC.QAbstractItemModel, index: QtC.QModelIndex):
+        type_id = editor.currentData()
+        if type_id != index.data(QtC.Qt.UserRole):
+            self._tab.set_type_cell(index.row(), type_id)
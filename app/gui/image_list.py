@@ -341,13 +341,13 @@ class _FlowImageItem(QtW.QFrame, ImageItem):
         layout = QtW.QVBoxLayout()
         layout.setContentsMargins(2, 2, 2, 2)
 
-        self._image_view = components.Canvas(keep_border=False, show_errors=False, parent=self)
+        size = config.CONFIG.thumbnail_size
+        self._image_view = components.Canvas(keep_border=False, show_errors=False, max_size=size, parent=self)
         # Allows file drag-and-drop
         self._image_view.dragEnterEvent = self.dragEnterEvent
         self._image_view.dragMoveEvent = self.dragMoveEvent
         self._image_view.dropEvent = self.dropEvent
         self._image_view.set_image(self._image.path)
-        size = config.CONFIG.thumbnail_size
         self._image_view.setFixedSize(QtC.QSize(size, size))
         self._image_view.mousePressEvent = self.mousePressEvent
         self._image_view.mouseReleaseEvent = self.mouseReleaseEvent
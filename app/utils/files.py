@@ -1,6 +1,9 @@
 """Utility functions to handle files."""
+import ctypes
+import errno
 import os
 import pathlib
+import shutil
 
 from app import constants
 
@@ -45,3 +48,80 @@ def get_extension(filename: str | pathlib.Path, keep_dot: bool = False) -> str:
     if not keep_dot and ext:
         return ext[1:].lower()
     return ext.lower()
+
+
+_MOVEFILE_COPY_ALLOWED = 0x2
+_MOVEFILE_WRITE_THROUGH = 0x8
+_COPY_CHUNK_SIZE = 1 << 30
+
+
+def move_file(path: pathlib.Path, new_path: pathlib.Path):
+    """Moves a file. Unlike shutil.move, the destination must be the full path of the new file.
+    An existing destination file is never overwritten, even if it is created while the file is being moved.
+
+    Files are moved without copying their content when possible (MoveFileExW on Windows, a hard link on other
+    systems). When moving to another device, the copy is left to the kernel (copy_file_range on Linux),
+    falling back to shutil.
+
+    :param path: Path of the file to move.
+    :param new_path: Path of the moved file.
+    :raise FileExistsError: If the destination file already exists.
+    :raise OSError: If the file could not be moved.
+    """
+    if os.name == 'nt':
+        # Existing files are not replaced without the MOVEFILE_REPLACE_EXISTING flag
+        flags = _MOVEFILE_COPY_ALLOWED | _MOVEFILE_WRITE_THROUGH
+        if not ctypes.windll.kernel32.MoveFileExW(str(path), str(new_path), flags):
+            raise ctypes.WinError()
+        return
+    # Unlike os.rename, os.link fails if the destination exists instead of silently replacing it
+    try:
+        os.link(path, new_path, follow_symlinks=False)
+    except OSError as e:
+        # Cross-device move or file system without hard links
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.EMLINK):
+            raise
+    else:
+        try:
+            path.unlink()
+        except OSError:
+            new_path.unlink(missing_ok=True)
+            raise
+        return
+    _copy_file(path, new_path)
+    path.unlink()
+
+
+def _copy_file(path: pathlib.Path, new_path: pathlib.Path):
+    """Copies a file to a new file along with its metadata, using copy_file_range when the system supports it.
+    The new file is removed if the copy fails.
+
+    :param path: Path of the file to copy.
+    :param new_path: Path of the new file.
+    :raise FileExistsError: If the destination file already exists.
+    :raise OSError: If the file could not be copied.
+    """
+    with path.open('rb') as src:
+        # Exclusive creation, an existing file is left untouched
+        dst = new_path.open('xb')
+        try:
+            with dst:
+                if hasattr(os, 'copy_file_range'):
+                    try:
+                        while os.copy_file_range(src.fileno(), dst.fileno(), _COPY_CHUNK_SIZE):
+                            pass
+                    except OSError as e:
+                        # Not supported by the kernel or between these file systems
+                        if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                            raise
+                        # Start over with a plain copy
+                        src.seek(0)
+                        dst.seek(0)
+                        dst.truncate()
+                        shutil.copyfileobj(src, dst)
+                else:
+                    shutil.copyfileobj(src, dst)
+            shutil.copystat(path, new_path)
+        except BaseException:
+            new_path.unlink(missing_ok=True)
+            raise
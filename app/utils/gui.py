@@ -3,6 +3,7 @@ import pathlib
 import platform
 import subprocess
 
+import PyQt5.QtCore as QtC
 import PyQt5.QtGui as QtG
 import PyQt5.QtWidgets as QtW
 
@@ -199,6 +200,10 @@ def center(window: QtW.QWidget):
     window.move(rect.topLeft())
 
 
+# Pending file manager calls, watchers must stay referenced until the reply arrives
+_DBUS_WATCHERS: set[QtC.QObject] = set()
+
+
 def show_file(file_path: pathlib.Path):
     """Shows the given file in the system’s file explorer."""
     try:
@@ -209,14 +214,52 @@ def show_file(file_path: pathlib.Path):
     if os_name == 'windows':
         subprocess.Popen(f'explorer /select,"{path}"')
     elif os_name == 'linux':
-        command = ['dbus-send', '--dest=org.freedesktop.FileManager1', '--type=method_call',
-                   '/org/freedesktop/FileManager1', 'org.freedesktop.FileManager1.ShowItems',
-                   f'array:string:file:{path}', 'string:""']
-        subprocess.Popen(command)
+        absolute_path = pathlib.Path(path)
+        if not _show_file_dbus(absolute_path):
+            _show_parent_directory(absolute_path)
     elif os_name == 'darwin':  # OS-X
         subprocess.Popen(['open', '-R', path])
 
 
+def _show_file_dbus(file_path: pathlib.Path) -> bool:
+    """Asks the file manager to show the given file through the session bus, without spawning a process.
+    The call is asynchronous, the parent directory is opened instead if the file manager replies with an error.
+
+    :param file_path: The file to show.
+    :return: True if the call could be sent, false if the session bus is not available.
+    """
+    try:
+        import PyQt5.QtDBus as QtDBus
+    except ImportError:
+        return False
+    bus = QtDBus.QDBusConnection.sessionBus()
+    if not bus.isConnected():
+        return False
+    # The service is not checked for as the bus starts it if it is activatable but not running yet
+    service = 'org.freedesktop.FileManager1'
+    message = QtDBus.QDBusMessage.createMethodCall(service, '/org/freedesktop/FileManager1', service, 'ShowItems')
+    # ShowItems expects an array of strings, a plain list would be sent as an array of variants
+    urls = QtDBus.QDBusArgument([QtC.QUrl.fromLocalFile(str(file_path)).toString()], QtC.QMetaType.QStringList)
+    message.setArguments([urls, ''])
+
+    watcher = QtDBus.QDBusPendingCallWatcher(bus.asyncCall(message))
+
+    def on_finished(w: QtDBus.QDBusPendingCallWatcher):
+        _DBUS_WATCHERS.discard(w)
+        if w.isError():
+            _show_parent_directory(file_path)
+        w.deleteLater()
+
+    _DBUS_WATCHERS.add(watcher)
+    watcher.finished.connect(on_finished)
+    return True
+
+
+def _show_parent_directory(file_path: pathlib.Path):
+    """Opens the directory of the given file with the default file manager."""
+    QtG.QDesktopServices.openUrl(QtC.QUrl.fromLocalFile(str(file_path.parent)))
+
+
 def negate(color: QtG.QColor) -> QtG.QColor:
     """Negates the given color.
 
@@ -243,23 +286,28 @@ def font_color(bg_color: QtG.QColor) -> QtG.QColor:
     return _BLACK if luminance > 0.179 else _WHITE
 
 
+_ICONS_CACHE: dict[tuple[str, bool], QtG.QIcon] = {}
+
+
 def icon(icon_name: str, use_theme: bool = True) -> QtG.QIcon:
-    """Returns a QIcon for the given icon name.
+    """Returns a QIcon for the given icon name. Icons are loaded only once and then cached.
 
     :param icon_name: Icon name, without file extension.
     :param use_theme: Whether to icons theme.
     :return: The QIcon object.
     """
+    key = (icon_name, use_theme)
+    if key not in _ICONS_CACHE:
+        if use_theme:
+            icon_ = QtG.QIcon.fromTheme(icon_name)
+        else:
+            icon_ = None
 
-    if use_theme:
-        icon_ = QtG.QIcon.fromTheme(icon_name)
-    else:
-        icon_ = None
-
-    if not icon_ or icon_.isNull():
-        return QtG.QIcon(str(constants.ICONS_DIR / (icon_name + '.png')))
-    else:
-        return icon_
+        if not icon_ or icon_.isNull():
+            icon_ = QtG.QIcon(str(constants.ICONS_DIR / (icon_name + '.png')))
+        _ICONS_CACHE[key] = icon_
+    # QIcon is implicitly shared, copies are cheap
+    return QtG.QIcon(_ICONS_CACHE[key])
 
 
 def get_key_sequence(event: QtG.QKeyEvent) -> QtG.QKeySequence:
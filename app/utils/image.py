@@ -2,6 +2,10 @@
 import pathlib
 
 import cv2
+import numpy as np
+
+# Maximum Hamming distance between the hashes of two similar images
+HASH_DISTANCE_THRESHOLD = 10
 
 
 def get_hash(image_path: pathlib.Path, diff_size: int = 8) -> int | None:
@@ -25,7 +29,7 @@ def get_hash(image_path: pathlib.Path, diff_size: int = 8) -> int | None:
     return sum([2 ** i for i, v in enumerate(diff.flatten()) if v])
 
 
-def compare_hashes(hash1: int, hash2: int, diff_size: int = 8) -> tuple[int, float | None, bool]:
+def compare_hashes(hash1: int, hash2: int) -> tuple[int, float | None, bool]:
     """Compares two image hashes. Two hashes are considered similar if their Hamming distance
     is ≤ 10 (cf. http://www.hackerfactor.com/blog/index.php?/archives/529-Kind-of-Like-That.html).
 
@@ -33,22 +37,28 @@ def compare_hashes(hash1: int, hash2: int, diff_size: int = 8) -> tuple[int, flo
 
     :param hash1: A hash.
     :param hash2: Another hash.
-    :param diff_size: Size of the difference matrix.
     :return: Three values: the Hamming distance, the similarity confidence coefficient (None if third value is False)
         and a boolean indicating whether the images behind the hashes are similar or not.
     """
-    threslhold = 10
-    h1 = bin(hash1)[2:].rjust(diff_size ** 2, '0')
-    h2 = bin(hash2)[2:].rjust(diff_size ** 2, '0')
-    dist_counter = 0
-    for n in range(len(h1)):
-        if h1[n] != h2[n]:
-            dist_counter += 1
+    threslhold = HASH_DISTANCE_THRESHOLD
+    # Number of differing bits
+    dist_counter = (hash1 ^ hash2).bit_count()
     similar = dist_counter <= threslhold
     confidence = ((threslhold + 1) - dist_counter) / (threslhold + 1) if similar else None
     return dist_counter, confidence, similar
 
 
+def hash_distances(hash_: int, hashes: np.ndarray) -> np.ndarray:
+    """Computes the Hamming distances between a hash and an array of hashes in a single vectorized pass.
+
+    :param hash_: A hash.
+    :param hashes: An array of 64-bit unsigned hashes.
+    :return: The array of distances.
+    """
+    xor = np.bitwise_xor(hashes.astype(np.uint64, copy=False), np.uint64(hash_))
+    return np.unpackbits(xor.view(np.uint8)).reshape(-1, 64).sum(axis=1)
+
+
 def image_size(image_path: pathlib.Path) -> tuple[int, int] | None:
     """Returns the size of the given image file.
 